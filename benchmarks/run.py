@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks do Mindu.
+
+Roda cenários típicos de jogos sem janela nem áudio (drivers "dummy" do SDL),
+com o loop interno do Mindu sem limite de iterações por segundo, e imprime os
+resultados em JSON: iterações por segundo, tempo gasto em cada fase das
+iterações e pico de memória residente.
+
+Cada cenário roda num processo próprio, para que o pico de memória de um não
+contamine o do outro. Uso:
+
+    python benchmarks/run.py [cenário ...] [--iterations N] [--output arquivo]
+
+Sem cenários, todos são rodados. Use --list para conhecer os cenários.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import subprocess
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+# O Mindu é importado da árvore do repositório, não de uma instalação.
+sys.path.insert(0, ROOT)
+
+import pygame
+import mindu
+
+ASSETS = os.path.join(ROOT, 'examples', 'FirePigFire')
+
+SIZE = (640, 400)
+
+
+
+def images():
+    bomb = mindu.Image(os.path.join(ASSETS, 'images', 'bomb.png'))
+    sprites = []
+
+    for i in range(2000):
+        sprite = bomb.copy()
+        sprite.center = (random.randrange(SIZE[0]), random.randrange(SIZE[1]))
+        sprites.append(sprite)
+
+    def iterate():
+        for sprite in sprites: sprite.draw()
+
+    return iterate
+
+
+
+def osd():
+    background = mindu.Image(os.path.join(ASSETS, 'images', 'background.png'), False)
+    bomb = mindu.Image(os.path.join(ASSETS, 'images', 'bomb.png'), osd = True)
+    sprites = []
+
+    for i in range(500):
+        sprite = bomb.copy()
+        sprite.center = (random.randrange(SIZE[0]), random.randrange(SIZE[1]))
+        sprites.append(sprite)
+
+    def iterate():
+        background.draw()
+        for sprite in sprites: sprite.draw()
+
+    return iterate
+
+
+
+def filters():
+    background = mindu.Image(os.path.join(ASSETS, 'images', 'background.png'), False)
+    ship = mindu.Image(os.path.join(ASSETS, 'images', 'ship.png'))
+
+    mindu.screen.zoom = 0.5
+    mindu.screen.bright = 0.8
+    mindu.screen.red = 0.9
+    mindu.screen.green = 0.7
+
+    def iterate():
+        background.draw()
+        ship.centerx = (ship.centerx + 3) % SIZE[0]
+        ship.draw()
+        mindu.screen.zcenter = ship.center
+
+    return iterate
+
+
+
+def labels():
+    font = os.path.join(ASSETS, 'fonts', 'biting.ttf')
+    score = mindu.Label('0', font, 40, osd = True, topleft = (10, 10))
+    count = [0]
+
+    def iterate():
+        count[0] += 1
+        score.set_text(str(count[0]))
+        score.draw()
+
+    return iterate
+
+
+
+def explosions():
+    directory = os.path.join(ASSETS, 'animations', 'explosion')
+    explosion = mindu.Animation(directory, redraw = 2, repeat = False)
+    active = []
+
+    def iterate():
+        for i in range(5):
+            copy = explosion.copy()
+            copy.play()
+            copy.center = (random.randrange(SIZE[0]), random.randrange(SIZE[1]))
+            active.append(copy)
+
+        for copy in active: copy.draw()
+        active[:] = [copy for copy in active if copy.running()][-100:]
+
+    return iterate
+
+
+
+def replay():
+    background = mindu.Image(os.path.join(ASSETS, 'images', 'background.png'), False)
+    directory = os.path.join(ASSETS, 'animations', 'pig-walking')
+    pig = mindu.Animation(directory, redraw = 5, midbottom = (0, SIZE[1] - 10))
+
+    mindu.screen.set_replay_length(600)
+
+    def iterate():
+        background.draw()
+        pig.move(2, 0)
+        if pig.left > SIZE[0]: pig.right = 0
+        pig.draw()
+
+    return iterate
+
+
+
+def replay_compress():
+    iterate = replay()
+    mindu.screen.set_replay_compress(True)
+
+    return iterate
+
+
+
+def dirty():
+    background = mindu.Image(os.path.join(ASSETS, 'images', 'background.png'), False)
+    directory = os.path.join(ASSETS, 'animations', 'pig-walking')
+    pig = mindu.Animation(directory, redraw = 5, midbottom = (0, SIZE[1] - 10))
+
+    mindu.screen.set_dirty(True)
+
+    def iterate():
+        background.draw()
+        pig.move(2, 0)
+        if pig.left > SIZE[0]: pig.right = 0
+        pig.draw()
+
+    return iterate
+
+
+
+SCENARIOS = {'images': images,
+             'osd': osd,
+             'filters': filters,
+             'labels': labels,
+             'explosions': explosions,
+             'replay': replay,
+             'replay-compress': replay_compress,
+             'dirty': dirty}
+
+
+
+def peak_rss():
+
+    try: import resource
+
+    except ImportError: return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # O Linux informa kilobytes, e o macOS, bytes.
+    if sys.platform == 'darwin': rss //= 1024
+
+    return rss
+
+
+
+def child(name, iterations):
+    random.seed(0)
+
+    mindu.screen.set_size(SIZE)
+    mindu.loop.set_ips(1000000)
+
+    iterate = SCENARIOS[name]()
+    count = [0]
+    start = [0.0]
+
+    # A primeira iteração fica de fora da medição, pois inclui a criação da
+    # tela e o primeiro desenho de cada surface.
+    def on_iterate():
+        iterate()
+        count[0] += 1
+
+        if count[0] == 1:
+            start[0] = time.perf_counter()
+            mindu.loop.set_profiling(True)
+
+        elif count[0] > iterations:
+            mindu.loop.stop()
+
+    mindu.loop.on_iterate(on_iterate)
+    mindu.loop.start()
+
+    seconds = time.perf_counter() - start[0]
+
+    return {'scenario': name,
+            'iterations': iterations,
+            'seconds': seconds,
+            'ips': iterations / seconds,
+            'phases': mindu.loop.get_profile(),
+            'peak_rss_kb': peak_rss()}
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmarks do Mindu.')
+    parser.add_argument('scenarios', nargs = '*', metavar = 'cenário')
+    parser.add_argument('--iterations', type = int, default = 600)
+    parser.add_argument('--output', default = None)
+    parser.add_argument('--list', action = 'store_true')
+    parser.add_argument('--child', default = None, help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.list:
+        for name in sorted(SCENARIOS): print(name)
+        return
+
+    if args.child is not None:
+        print(json.dumps(child(args.child, args.iterations)))
+        return
+
+    names = args.scenarios or sorted(SCENARIOS)
+
+    for name in names:
+        if name not in SCENARIOS: parser.error('cenário inválido: "{}"'.format(name))
+
+    results = []
+
+    for name in names:
+        command = [sys.executable, os.path.abspath(__file__), '--child', name,
+                   '--iterations', str(args.iterations)]
+
+        output = subprocess.check_output(command, cwd = ROOT)
+        results.append(json.loads(output.decode('utf-8').splitlines()[-1]))
+
+    report = {'python': sys.version.split()[0],
+              'pygame': pygame.version.ver,
+              'size': SIZE,
+              'results': results}
+
+    text = json.dumps(report, indent = 2, sort_keys = True)
+
+    if args.output is None: print(text)
+
+    else:
+        with open(args.output, 'w') as file: file.write(text + '\n')
+
+
+
+if __name__ == '__main__': main()
@@ -26,11 +26,15 @@ O Mindu provê:
 reload_joysticks ------ função para recarregar os joysticks.
 
 Animation - tipo de objeto para representar animações.
+Atlas ----- tipo de objeto para representar folhas de sprites.
+Batch ----- tipo de objeto para desenhar muitos sprites de uma só vez.
 Error ----- tipo de erros específicos do Mindu.
+Group ----- tipo de objeto para verificar colisões entre muitos sprites.
 Image ----- tipo de objeto para representar imagens.
 Label ----- tipo de objeto para representar imagens textuais.
 Sound ----- tipo de objeto para representar sons.
 
+assets ---- objeto com funcionalidades para lidar com o cache de imagens.
 channels -- tupla de objetos com funcionalidades para lidar com canais de som.
 joysticks - tupla de objetos com funcionalidades para lidar com joysticks.
 keyboard -- objeto com funcionalidades para lidar com o teclado.
@@ -65,28 +69,38 @@ pygame.event.set_allowed(pygame.JOYBUTTONUP)
 pygame.event.set_allowed(pygame.JOYBUTTONDOWN)
 
 from mindu.error import Error
+from mindu.assets import Assets
+from mindu.loading import Loading
+from mindu.atlas import Atlas
 from mindu.input import Input
+from mindu.binding import Binding
 from mindu.sprite import Sprite
 from mindu.image import Image
 from mindu.label import Label
 from mindu.animation import Animation
+from mindu.group import Group
+from mindu.batch import Batch
+from mindu.replay import Replay
 from mindu.sound import Sound
 from mindu.keyboard import Keyboard
 from mindu.mouse import Mouse
 from mindu.joystick import Joystick
+from mindu.task import Task
+from mindu.profiler import Profiler
 from mindu.loop import Loop
 from mindu.screen import Screen
 from mindu.channel import Channel
 
-__all__ = ('reload_joysticks', 'Animation', 'Error', 'Image', 'Label', 'Sound',
-           'channels', 'joysticks', 'keyboard', 'logo', 'loop', 'mouse',
-           'screen', 'version')
+__all__ = ('reload_joysticks', 'Animation', 'Atlas', 'Batch', 'Error', 'Group',
+           'Image', 'Label', 'Sound', 'assets', 'channels', 'joysticks', 'keyboard',
+           'logo', 'loop', 'mouse', 'screen', 'version')
 
 __author__ = 'José Falero <jzfalero.@gmail.com>'
 __version__ = '1.0'
 
 version = (1, 0)
 
+assets = Assets()
 keyboard = Keyboard()
 mouse = Mouse()
 joysticks = tuple([Joystick(id) for id in range(pygame.joystick.get_count())])
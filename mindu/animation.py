@@ -23,7 +23,6 @@ A classe Animation está definida aqui.
 """
 
 import os
-import pygame
 import mindu
 
 
@@ -37,6 +36,7 @@ class Animation(mindu.Sprite):
                repeat = True,
                running = True,
                osd = True,
+               regions = None,
                **position ) -> Animation
 
     Sprite para representar animações.
@@ -44,10 +44,11 @@ class Animation(mindu.Sprite):
     O argumento "directory" é uma string representando o nome do diretório que
     contém os arquivos de imagem a serem carregados como quadros da animação. Os
     formatos de arquivo de imagem suportados são: JPEG, PNG, GIF, BMP, PCX, TGA,
-    TIF, LBM, PBM e XPM.
+    TIF, LBM, PBM e XPM. O argumento também pode ser um objeto Atlas, cujos
+    quadros serão usados como quadros da animação.
 
     O argumento "alpha" é True ou False, indicando se a animação possui canal
-    alpha (transparência).
+    alpha (transparência). É ignorado se "directory" for um objeto Atlas.
 
     O argumento "redraw" é um inteiro maior que 0, indicando quantas vezes cada
     quadro deve ser desenhado antes de ser substituído pelo próximo.
@@ -65,6 +66,11 @@ class Animation(mindu.Sprite):
     O argumento "osd" é True ou False, indicando se a animação é On-Screen
     Display.
 
+    O argumento "regions" é None ou uma lista com os nomes dos quadros do atlas
+    a serem usados, na ordem desejada. Se for None, todos os quadros do atlas
+    são usados, na ordem em que aparecem nele. Só pode ser usado se "directory"
+    for um objeto Atlas.
+
     Os argumentos de palavra-chave opcionais "**position" servem para posicionar
     a animação em relação à tela. Os argumentos de palavra-chave válidos são:
 
@@ -99,44 +105,40 @@ class Animation(mindu.Sprite):
                   repeat = True,
                   running = True,
                   osd = False,
+                  regions = None,
                   **position  ):
 
         if not isinstance(alpha, bool):
             raise TypeError('Animation(): o argumento "alpha" precisa ser True ou False')
 
-        if not isinstance(directory, str):
-            raise TypeError('Animation(): o argumento "directory" precisa ser string')
-
-        if not os.path.exists(directory):
-            raise mindu.Error('Animation(): o diretório "{}" não existe'.format(directory))
-
-        if not os.path.isdir(directory):
-            raise mindu.Error('Animation(): "{}" não é um diretório'.format(directory))
+        if isinstance(directory, mindu.Atlas):
 
-        files = [os.path.join(directory, file) for file in os.listdir(directory)]
+            if regions is None:
+                regions = directory._names
 
-        if not files:
-            raise mindu.Error('Animation(): o diretório "{}" está vazio'.format(directory))
+            elif not isinstance(regions, (list, tuple)):
+                raise TypeError('Animation(): o argumento "regions" precisa ser lista, tupla ou None')
 
-        files.sort()
+            elif not regions:
+                raise ValueError('Animation(): o argumento "regions" não pode ser vazio')
 
-        self._surfs = []
+            self._surfs = []
 
-        for file in files:
+            for name in regions:
 
-            try: surface = pygame.image.load(file)
+                if name not in directory._subs:
+                    raise ValueError('Animation(): quadro inexistente no atlas: "{}"'.format(name))
 
-            except:
-                raise mindu.Error('Animation(): impossível carregar o arquivo "{}"'.format(file))
+                self._surfs.append(directory._subs[name])
 
-            if alpha:
-                surf = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        elif not isinstance(directory, str):
+            raise TypeError('Animation(): o argumento "directory" precisa ser string ou Atlas')
 
-            else:
-                surf = pygame.Surface(surface.get_size())
+        elif regions is not None:
+            raise ValueError('Animation(): o argumento "regions" só pode ser usado com um Atlas')
 
-            surf.blit(surface, (0, 0))
-            self._surfs.append(surf)
+        else:
+            self._surfs = self._load(directory, alpha)
 
         if not isinstance(redraw, int):
             raise TypeError('Animation(): o argumento "redraw" precisa ser inteiro')
@@ -177,6 +179,8 @@ class Animation(mindu.Sprite):
         self._surf = self._surfs[self._index]
         self._rect = self._rects[self._index]
 
+        mindu.assets._track(self)
+
         for (key, value) in position.items():
 
             if key not in ('top', 'left', 'bottom', 'right', 'topleft',
@@ -190,31 +194,68 @@ class Animation(mindu.Sprite):
 
 
 
+    def _load(self, directory, alpha):
+
+        if not os.path.exists(directory):
+            raise mindu.Error('Animation(): o diretório "{}" não existe'.format(directory))
+
+        if not os.path.isdir(directory):
+            raise mindu.Error('Animation(): "{}" não é um diretório'.format(directory))
+
+        files = [os.path.join(directory, file) for file in os.listdir(directory)]
+
+        if not files:
+            raise mindu.Error('Animation(): o diretório "{}" está vazio'.format(directory))
+
+        files.sort()
+
+        surfs = []
+
+        # Decodificando todos os quadros em paralelo antes de montá-los.
+        mindu.assets._prefetch(files, alpha)
+
+        for file in files:
+
+            try: surf = mindu.assets._load(file, alpha)
+
+            except:
+                raise mindu.Error('Animation(): impossível carregar o arquivo "{}"'.format(file))
+
+            surfs.append(surf)
+
+        return surfs
+
+
+
     def _update(self):
         if not self._running: return
 
-        self._redraw_count += 1
+        # A animação avança conforme os passos da simulação; sem passo fixo,
+        # há sempre exatamente um passo por iteração.
+        self._redraw_count += mindu.loop._steps
 
-        if self._redraw_count == self._redraw:
-            self._redraw_count = 0
-            self._index += 1
+        if self._redraw_count >= self._redraw:
+            (frames, self._redraw_count) = divmod(self._redraw_count, self._redraw)
+            index = self._index + frames
 
-            if self._index == self._limit:
+            if index >= self._limit:
 
                 if not self._repeat:
-                    self._index -= 1
+                    index = self._limit - 1
                     self._running = False
 
-                    return
+                    if index == self._index: return
 
                 else:
-                    self._index = 0
+                    index %= self._limit
 
+            self._index = index
             self._surf = self._surfs[self._index]
 
             anchor_value = getattr(self._rect, self._anchor)
             self._rect = self._rects[self._index]
             setattr(self._rect, self._anchor, anchor_value)
+            self._mark()
 
 
 
@@ -234,6 +275,7 @@ class Animation(mindu.Sprite):
         anchor = getattr(self._rect, self._anchor)
         self._rect = self._rects[self._index]
         setattr(self._rect, self._anchor, anchor)
+        self._mark()
 
 
 
@@ -400,6 +442,8 @@ class Animation(mindu.Sprite):
         copy._rect = copy._rects[copy._index]
         copy._osd = self._osd
 
+        mindu.assets._track(copy)
+
         return copy
 
 
@@ -432,17 +476,42 @@ class Animation(mindu.Sprite):
         copy._index = self._index
         copy._limit = self._limit
         copy._running = self._running
-        copy._surfs = [pygame.transform.flip(surf, hbool, vbool) for surf in self._surfs]
+        copy._surfs = [mindu.assets._transform(surf, 'flip', (hbool, vbool)) for surf in self._surfs]
         copy._rects = [surf.get_rect() for surf in copy._surfs]
         copy._surf = copy._surfs[copy._index]
         copy._rect = copy._rects[copy._index]
         copy._rect.center = self._rect.center
         copy._osd = self._osd
 
+        mindu.assets._track(copy)
+
         return copy
 
 
 
+    def bake_rotations(self, steps):
+        """
+        bake_rotations(steps) -> None
+
+        Pré-calcula as rotações da animação em "steps" ângulos igualmente
+        espaçados, de modo que o método rotate() passe a apenas escolher a
+        rotação pré-calculada mais próxima do ângulo pedido, sem calcular nada.
+        Vale também para as cópias feitas pelo método copy().
+
+        O argumento "steps" é um inteiro maior que 0. Por exemplo, 72 resulta em
+        rotações de 5 em 5 graus.
+        """
+
+        if not isinstance(steps, int):
+            raise TypeError('bake_rotations(): o argumento "steps" precisa ser inteiro')
+
+        if steps <= 0:
+            raise ValueError('bake_rotations(): o argumento "steps" precisa ser maior que 0')
+
+        for surf in self._surfs: mindu.assets._bake(surf, steps)
+
+
+
     def rotate(self, angle):
         """
         rotate(angle) -> Animation
@@ -450,7 +519,8 @@ class Animation(mindu.Sprite):
         Cria uma cópia rotacionada da animação.
 
         O argumento "angle" é um float representando quantos graus rotacionar a
-        cópia.
+        cópia. Se as rotações da animação foram pré-calculadas com o método
+        bake_rotations(), a rotação pré-calculada mais próxima é usada.
         """
 
         if not isinstance(angle, float):
@@ -465,13 +535,15 @@ class Animation(mindu.Sprite):
         copy._index = self._index
         copy._limit = self._limit
         copy._running = self._running
-        copy._surfs = [pygame.transform.rotozoom(surf, -angle, 1.0) for surf in self._surfs]
+        copy._surfs = [mindu.assets._transform(surf, 'rotate', angle) for surf in self._surfs]
         copy._rects = [surf.get_rect() for surf in copy._surfs]
         copy._surf = copy._surfs[copy._index]
         copy._rect = copy._rects[copy._index]
         copy._rect.center = self._rect.center
         copy._osd = self._osd
 
+        mindu.assets._track(copy)
+
         return copy
 
 
@@ -502,13 +574,15 @@ class Animation(mindu.Sprite):
         copy._index = self._index
         copy._limit = self._limit
         copy._running = self._running
-        copy._surfs = [pygame.transform.rotozoom(surf, 0.0, scale) for surf in self._surfs]
+        copy._surfs = [mindu.assets._transform(surf, 'scale', scale) for surf in self._surfs]
         copy._rects = [surf.get_rect() for surf in copy._surfs]
         copy._surf = copy._surfs[copy._index]
         copy._rect = copy._rects[copy._index]
         copy._rect.center = self._rect.center
         copy._osd = self._osd
 
+        mindu.assets._track(copy)
+
         return copy
 
 
@@ -0,0 +1,653 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017 José Falero.
+#
+# ﻿This file is part of Mindu.
+#
+# Mindu is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mindu is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mindu.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Author: José Falero <jzfalero.@gmail.com>.
+"""
+A classe Assets está definida aqui.
+"""
+
+import os
+import weakref
+import collections
+import concurrent.futures
+import pygame
+import mindu
+
+
+
+class Assets(object):
+    """
+    Objeto para lidar com o cache de imagens.
+
+    As imagens carregadas pelos objetos Image e Animation ficam guardadas num
+    cache compartilhado por todo o programa, de modo que carregar o mesmo
+    arquivo outra vez não exige decodificá-lo de novo. As surfaces guardadas
+    são compartilhadas entre todos os sprites que as usam, e nunca são
+    modificadas.
+
+    A decodificação dos arquivos pode ser feita em paralelo, em threads de
+    trabalho, enquanto o cache só é modificado pela thread principal.
+
+    Há também caches, com limites de memória próprios, para as cópias
+    espelhadas, rotacionadas e redimensionadas dos sprites e para os textos
+    renderizados pelos objetos Label, de modo que repetir a mesma
+    transformação ou voltar a um texto já exibido não exige calculá-lo de novo.
+    """
+
+    __slots__ = ('_surfs', '_bytes', '_budget', '_hits', '_misses',
+                 '_evictions', '_sprites', '_atlases', '_formats', '_pool',
+                 '_pending', '_transforms', '_transform_bytes',
+                 '_transform_budget', '_transform_hits', '_transform_misses',
+                 '_baked', '_fonts', '_labels', '_label_bytes',
+                 '_label_budget', '_label_hits', '_label_misses', '_masks',
+                 '_frames')
+
+
+
+    def __init__(self):
+
+        # Dicionário ordenado do menos para o mais recentemente usado, com
+        # chaves (arquivo, data de modificação, alpha).
+        self._surfs = collections.OrderedDict()
+        self._bytes = 0
+        self._budget = 128 * 1024 * 1024
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        # Todos os sprites vivos, e os formatos de pixel (tamanho em bits e
+        # máscaras) da tela para surfaces sem e com alpha, enquanto ela existe.
+        self._sprites = weakref.WeakSet()
+        self._atlases = weakref.WeakSet()
+        self._formats = None
+
+        # Listas de quadros já convertidas, com chaves id(lista) e, como
+        # valores, uma animação que usa a lista. Enquanto essa animação existir,
+        # a lista também existe, e o id não pode ser reaproveitado.
+        self._frames = weakref.WeakValueDictionary()
+
+        # Threads de trabalho, criadas só quando necessárias, e decodificações
+        # em andamento ou ainda não reclamadas pelo cache, com as mesmas
+        # chaves do cache.
+        self._pool = None
+        self._pending = {}
+
+        # Transformações, do menos para o mais recentemente usado, com chaves
+        # (referência fraca à surface de origem, operação, parâmetros), e
+        # rotações pré-calculadas, que nunca são descartadas enquanto a surface
+        # de origem existir.
+        self._transforms = collections.OrderedDict()
+        self._transform_bytes = 0
+        self._transform_budget = 32 * 1024 * 1024
+        self._transform_hits = 0
+        self._transform_misses = 0
+        self._baked = weakref.WeakKeyDictionary()
+
+        # Fontes compartilhadas pelos objetos Label, com chaves (arquivo,
+        # tamanho). Cada fonte existe enquanto algum rótulo a estiver usando.
+        self._fonts = weakref.WeakValueDictionary()
+
+        # Textos renderizados, do menos para o mais recentemente usado, com
+        # chaves (texto, chave da fonte, cor, alinhamento, itálico, negrito,
+        # sublinhado). A fonte entra pela sua chave em self._fonts, e não pelo
+        # objeto, para que o cache não a mantenha viva.
+        self._labels = collections.OrderedDict()
+        self._label_bytes = 0
+        self._label_budget = 4 * 1024 * 1024
+        self._label_hits = 0
+        self._label_misses = 0
+
+        # Máscaras de colisão, calculadas uma única vez para cada surface e
+        # descartadas junto com ela. Como as transformações também ficam no
+        # cache, cópias rotacionadas ou redimensionadas iguais compartilham a
+        # mesma máscara.
+        self._masks = weakref.WeakKeyDictionary()
+
+
+
+    def _key(self, file, alpha):
+        return (os.path.abspath(file), os.path.getmtime(file), alpha)
+
+
+
+    def _decode(self, file, alpha):
+
+        # Executado nas threads de trabalho: não pode tocar no cache nem na
+        # tela, só em surfaces novas. O pygame libera o GIL enquanto decodifica
+        # PNG e JPEG, então várias imagens são decodificadas ao mesmo tempo.
+        surface = pygame.image.load(file)
+
+        if alpha:
+            surf = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+
+        else:
+            surf = pygame.Surface(surface.get_size())
+
+        surf.blit(surface, (0, 0))
+
+        return surf
+
+
+
+    def _prefetch(self, files, alpha):
+        keys = []
+
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(os.cpu_count() or 4)
+
+        for file in files:
+
+            # Arquivos problemáticos são ignorados aqui; o erro aparece quando
+            # eles forem carregados de fato.
+            try: key = self._key(file, alpha)
+            except OSError: continue
+
+            keys.append(key)
+
+            if (key in self._surfs) or (key in self._pending): continue
+
+            self._pending[key] = self._pool.submit(self._decode, file, alpha)
+
+        return keys
+
+
+
+    def _claim(self, key):
+
+        # Transfere para o cache uma decodificação em paralelo que já terminou.
+        # Uma decodificação que falhou é descartada, para que o arquivo possa
+        # ser carregado de novo, e o erro é lançado.
+        future = self._pending.get(key)
+
+        if (future is None) or (not future.done()): return
+
+        del self._pending[key]
+
+        if future.exception() is not None:
+            raise mindu.Error('impossível carregar o arquivo "{}"'.format(key[0]))
+
+        self._misses += 1
+        self._store(key, future.result())
+
+
+
+    def _load(self, file, alpha):
+        key = self._key(file, alpha)
+        surf = self._surfs.get(key)
+
+        if surf is not None:
+            self._surfs.move_to_end(key)
+            self._hits += 1
+            return surf
+
+        self._misses += 1
+
+        future = self._pending.pop(key, None)
+
+        if future is None: surf = self._decode(file, alpha)
+        else: surf = future.result()
+
+        return self._store(key, surf)
+
+
+
+    def _store(self, key, surf):
+
+        if self._formats is not None: surf = self._converted(surf, {})
+
+        self._surfs[key] = surf
+        self._bytes += surf.get_pitch() * surf.get_height()
+        self._evict()
+
+        return surf
+
+
+
+    def _track(self, sprite):
+        self._sprites.add(sprite)
+
+        if self._formats is not None: self._convert_sprite(sprite, {})
+
+
+
+    def _track_atlas(self, atlas):
+
+        # A surface do atlas vem do cache, então já está no formato da tela se
+        # ela existir.
+        self._atlases.add(atlas)
+
+
+
+    def _convert(self):
+
+        # Convertendo para o formato de pixel da tela, de uma só vez, as
+        # surfaces do cache e as de todos os sprites vivos, para que desenhá-las
+        # não exija conversão pixel a pixel a cada quadro.
+        alpha = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+        plain = pygame.Surface((1, 1)).convert()
+
+        self._formats = ((plain.get_bitsize(), plain.get_masks()),
+                         (alpha.get_bitsize(), alpha.get_masks()))
+
+        memo = {}
+
+        for (key, surf) in self._surfs.items():
+            self._bytes -= surf.get_pitch() * surf.get_height()
+            surf = self._converted(surf, memo)
+            self._bytes += surf.get_pitch() * surf.get_height()
+            self._surfs[key] = surf
+
+        # Os atlas vêm antes dos sprites, para que os sprites que usam regiões
+        # deles recebam as regiões novas em vez de cópias.
+        for atlas in list(self._atlases): atlas._convert(memo)
+
+        self._frames.clear()
+
+        for sprite in list(self._sprites): self._convert_sprite(sprite, memo)
+
+        # As transformações guardadas são descartadas, e as rotações
+        # pré-calculadas passam a pertencer às surfaces de origem convertidas.
+        self._transforms.clear()
+        self._transform_bytes = 0
+
+        for (surf, (steps, surfs)) in list(self._baked.items()):
+            self._baked[self._converted(surf, memo)] = (steps, [self._converted(rotated, memo) for rotated in surfs])
+
+        self._evict()
+
+
+
+    def _convert_sprite(self, sprite, memo):
+
+        if isinstance(sprite, mindu.Animation):
+            surfs = sprite._surfs
+
+            # Os quadros de um replay comprimido são decodificados e convertidos
+            # sob demanda, pelo próprio objeto Frames.
+            if not isinstance(surfs, list): return
+
+            # A lista de quadros é compartilhada entre as cópias da animação,
+            # então é modificada no lugar, e só na primeira vez.
+            owner = self._frames.get(id(surfs))
+
+            if (owner is None) or (owner._surfs is not surfs):
+                surfs[:] = [self._converted(surf, memo) for surf in surfs]
+                self._frames[id(surfs)] = sprite
+
+            # Cada cópia aponta para o seu quadro atual dentro da lista, mesmo
+            # que ela já tenha sido convertida por outra cópia.
+            sprite._surf = surfs[sprite._index]
+
+        else:
+            sprite._surf = self._converted(sprite._surf, memo)
+
+
+
+    def _converted(self, surf, memo):
+
+        if surf in memo: return memo[surf]
+
+        alpha = bool(surf.get_flags() & pygame.SRCALPHA)
+
+        if (surf.get_bitsize(), surf.get_masks()) == self._formats[alpha]:
+            converted = surf
+
+        elif alpha:
+            converted = surf.convert_alpha()
+
+        else:
+            converted = surf.convert()
+
+            # Sem alpha por pixel, a codificação RLE acelera o desenho de
+            # surfaces com transparência por cor-chave ou alpha por surface.
+            colorkey = surf.get_colorkey()
+            if colorkey is not None: converted.set_colorkey(colorkey, pygame.RLEACCEL)
+
+            value = surf.get_alpha()
+            if (value is not None) and (value < 255): converted.set_alpha(value, pygame.RLEACCEL)
+
+        memo[surf] = converted
+
+        return converted
+
+
+
+    def _evict(self):
+
+        while self._surfs and (self._bytes > self._budget):
+            (key, surf) = self._surfs.popitem(last = False)
+            self._bytes -= surf.get_pitch() * surf.get_height()
+            self._evictions += 1
+
+        while self._transforms and (self._transform_bytes > self._transform_budget):
+            (key, surf) = self._transforms.popitem(last = False)
+            self._transform_bytes -= surf.get_pitch() * surf.get_height()
+
+        while self._labels and (self._label_bytes > self._label_budget):
+            (key, surf) = self._labels.popitem(last = False)
+            self._label_bytes -= surf.get_pitch() * surf.get_height()
+
+
+
+    def _transform(self, surf, operation, param):
+
+        # Com rotações pré-calculadas, rotacionar é só escolher a mais próxima.
+        if (operation == 'rotate') and (surf in self._baked):
+            (steps, surfs) = self._baked[surf]
+            return surfs[round(param * steps / 360.0) % steps]
+
+        # Os parâmetros contínuos são quantizados, para que valores praticamente
+        # iguais compartilhem o mesmo resultado. Escalas positivas minúsculas
+        # não podem virar 0.0, que resultaria numa surface vazia.
+        if operation == 'rotate': param = round(param % 360.0, 2)
+        elif operation == 'scale': param = max(round(param, 4), 0.0001)
+
+        # A surface de origem entra na chave por uma referência fraca, para que
+        # o cache não a mantenha viva fora do seu orçamento. Entradas de origens
+        # já destruídas não são mais encontradas e saem pelo descarte normal.
+        key = (weakref.ref(surf), operation, param)
+        result = self._transforms.get(key)
+
+        if result is not None:
+            self._transforms.move_to_end(key)
+            self._transform_hits += 1
+            return result
+
+        self._transform_misses += 1
+
+        if operation == 'flip':
+            result = pygame.transform.flip(surf, *param)
+
+        elif operation == 'rotate':
+            result = pygame.transform.rotozoom(surf, -param, 1.0)
+
+        elif operation == 'scale':
+            result = pygame.transform.rotozoom(surf, 0.0, param)
+
+        elif operation == 'resize':
+            result = pygame.transform.smoothscale(surf, param)
+
+        else:
+            result = pygame.transform.scale(surf, param)
+
+        if self._formats is not None: result = self._converted(result, {})
+
+        self._transforms[key] = result
+        self._transform_bytes += result.get_pitch() * result.get_height()
+        self._evict()
+
+        return result
+
+
+
+    def _bake(self, surf, steps):
+        surfs = []
+
+        for step in range(steps):
+            rotated = pygame.transform.rotozoom(surf, -step * 360.0 / steps, 1.0)
+            if self._formats is not None: rotated = self._converted(rotated, {})
+            surfs.append(rotated)
+
+        self._baked[surf] = (steps, surfs)
+
+
+
+    def _font_key(self, file, size):
+        return (None if file is None else os.path.abspath(file), size)
+
+
+
+    def _font(self, file, size):
+        key = self._font_key(file, size)
+        font = self._fonts.get(key)
+
+        if font is None:
+            font = pygame.font.Font(file, size)
+            self._fonts[key] = font
+
+        return font
+
+
+
+    def _rendered(self, key):
+        surf = self._labels.get(key)
+
+        if surf is None:
+            self._label_misses += 1
+            return None
+
+        self._labels.move_to_end(key)
+        self._label_hits += 1
+
+        return surf
+
+
+
+    def _keep_rendered(self, key, surf):
+        self._labels[key] = surf
+        self._label_bytes += surf.get_pitch() * surf.get_height()
+        self._evict()
+
+
+
+    def _mask(self, surf):
+        mask = self._masks.get(surf)
+
+        if mask is None:
+            mask = pygame.mask.from_surface(surf)
+            self._masks[surf] = mask
+
+        return mask
+
+
+
+    def preload(self, path, alpha = True):
+        """
+        preload(path, alpha = True) -> Loading
+
+        Começa a decodificar imagens em segundo plano e retorna um objeto
+        Loading, que pode ser consultado a cada iteração do loop para saber se
+        o carregamento terminou. Enquanto isso, o jogo continua rodando
+        normalmente (exibindo uma tela de carregamento, por exemplo). Depois
+        disso, criar objetos Image e Animation com os mesmos arquivos não exige
+        decodificá-los de novo.
+
+        O argumento "path" é uma string representando o caminho de um arquivo
+        de imagem ou de um diretório contendo arquivos de imagem, como o usado
+        por um objeto Animation.
+
+        O argumento "alpha" deve ser o mesmo que será passado para o objeto
+        Image ou Animation.
+        """
+
+        if not isinstance(path, str):
+            raise TypeError('preload(): o argumento "path" precisa ser string')
+
+        if not isinstance(alpha, bool):
+            raise TypeError('preload(): o argumento "alpha" precisa ser True ou False')
+
+        if not os.path.exists(path):
+            raise mindu.Error('preload(): o caminho "{}" não existe'.format(path))
+
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, file) for file in os.listdir(path))
+
+        else:
+            files = [path]
+
+        return mindu.Loading(self._prefetch(files, alpha))
+
+
+
+    def get_budget(self):
+        """
+        get_budget() -> int
+
+        Obtém o limite de memória do cache de imagens, em bytes.
+        """
+
+        return self._budget
+
+
+
+    def set_budget(self, budget):
+        """
+        set_budget(budget) -> None
+
+        Define o limite de memória do cache de imagens, em bytes. Quando o
+        limite é ultrapassado, as imagens usadas há mais tempo são descartadas
+        do cache (mas continuam válidas para os sprites que já as usam).
+
+        O argumento "budget" é um inteiro maior ou igual a 0. Se for 0, nenhuma
+        imagem é guardada no cache. O padrão é 128 MiB.
+        """
+
+        if not isinstance(budget, int):
+            raise TypeError('set_budget(): o argumento "budget" precisa ser inteiro')
+
+        if budget < 0:
+            raise ValueError('set_budget(): o argumento "budget" precisa ser maior ou igual a 0')
+
+        self._budget = budget
+        self._evict()
+
+
+
+    def get_transform_budget(self):
+        """
+        get_transform_budget() -> int
+
+        Obtém o limite de memória do cache de transformações, em bytes.
+        """
+
+        return self._transform_budget
+
+
+
+    def set_transform_budget(self, budget):
+        """
+        set_transform_budget(budget) -> None
+
+        Define o limite de memória do cache de transformações (cópias
+        espelhadas, rotacionadas e redimensionadas), em bytes. Quando o limite é
+        ultrapassado, as transformações usadas há mais tempo são descartadas.
+        Rotações pré-calculadas não contam para o limite.
+
+        O argumento "budget" é um inteiro maior ou igual a 0. Se for 0, nenhuma
+        transformação é guardada no cache. O padrão é 32 MiB.
+        """
+
+        if not isinstance(budget, int):
+            raise TypeError('set_transform_budget(): o argumento "budget" precisa ser inteiro')
+
+        if budget < 0:
+            raise ValueError('set_transform_budget(): o argumento "budget" precisa ser maior ou igual a 0')
+
+        self._transform_budget = budget
+        self._evict()
+
+
+
+    def get_label_budget(self):
+        """
+        get_label_budget() -> int
+
+        Obtém o limite de memória do cache de textos renderizados, em bytes.
+        """
+
+        return self._label_budget
+
+
+
+    def set_label_budget(self, budget):
+        """
+        set_label_budget(budget) -> None
+
+        Define o limite de memória do cache de textos renderizados pelos
+        objetos Label, em bytes. Quando o limite é ultrapassado, os textos
+        usados há mais tempo são descartados.
+
+        O argumento "budget" é um inteiro maior ou igual a 0. Se for 0, nenhum
+        texto é guardado no cache. O padrão é 4 MiB.
+        """
+
+        if not isinstance(budget, int):
+            raise TypeError('set_label_budget(): o argumento "budget" precisa ser inteiro')
+
+        if budget < 0:
+            raise ValueError('set_label_budget(): o argumento "budget" precisa ser maior ou igual a 0')
+
+        self._label_budget = budget
+        self._evict()
+
+
+
+    def get_stats(self):
+        """
+        get_stats() -> dict
+
+        Obtém as estatísticas do cache de imagens, num dicionário com as chaves:
+
+            "hits" ---------------- vezes que uma imagem foi encontrada no cache;
+            "misses" -------------- vezes que uma imagem precisou ser decodificada;
+            "evictions" ----------- imagens descartadas para respeitar o limite;
+            "count" --------------- imagens no cache agora;
+            "bytes" --------------- bytes ocupados pelas imagens no cache agora;
+            "transform_hits" ------ transformações encontradas no cache;
+            "transform_misses" ---- transformações que precisaram ser calculadas;
+            "transform_count" ----- transformações no cache agora;
+            "transform_bytes" ----- bytes ocupados pelas transformações agora;
+            "label_hits" ---------- textos encontrados no cache;
+            "label_misses" -------- textos que precisaram ser renderizados;
+            "label_count" --------- textos no cache agora;
+            "label_bytes" --------- bytes ocupados pelos textos agora.
+        """
+
+        return {'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'count': len(self._surfs),
+                'bytes': self._bytes,
+                'transform_hits': self._transform_hits,
+                'transform_misses': self._transform_misses,
+                'transform_count': len(self._transforms),
+                'transform_bytes': self._transform_bytes,
+                'label_hits': self._label_hits,
+                'label_misses': self._label_misses,
+                'label_count': len(self._labels),
+                'label_bytes': self._label_bytes}
+
+
+
+    def clear(self):
+        """
+        clear() -> None
+
+        Descarta todas as imagens, transformações e textos do cache.
+        """
+
+        self._surfs.clear()
+        self._bytes = 0
+
+        self._transforms.clear()
+        self._transform_bytes = 0
+
+        self._labels.clear()
+        self._label_bytes = 0
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017 José Falero.
+#
+# ﻿This file is part of Mindu.
+#
+# Mindu is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mindu is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mindu.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Author: José Falero <jzfalero.@gmail.com>.
+"""
+A classe Atlas está definida aqui.
+"""
+
+import os
+import json
+import pygame
+import mindu
+
+
+
+class Atlas(object):
+    """
+    Atlas(file, alpha = True, size = None) -> Atlas
+
+    Objeto para representar folhas de sprites (sprite sheets), isto é, vários
+    quadros guardados num mesmo arquivo de imagem. O arquivo é decodificado uma
+    única vez, e os quadros são regiões dele, que não ocupam memória adicional.
+    Objetos Atlas podem ser passados para objetos Image e Animation no lugar de
+    arquivos e diretórios.
+
+    O argumento "file" é uma string representando o nome do arquivo de imagem a
+    ser carregado.
+
+    O argumento "alpha" é True ou False, indicando se a imagem possui canal
+    alpha (transparência).
+
+    O argumento "size" é um par de inteiros representando as dimensões de cada
+    quadro, ou None. Se for um par de inteiros, a imagem é dividida numa grade
+    de quadros de mesmas dimensões, nomeados com inteiros a partir de 0, da
+    esquerda para a direita e de cima para baixo. Se for None, os quadros são
+    descritos por um arquivo JSON com o mesmo nome do arquivo de imagem e a
+    extensão ".json", no formato usado pelo TexturePacker (com "frames" sendo
+    um dicionário ou uma lista), e são nomeados pelas strings do arquivo JSON.
+    """
+
+    __slots__ = ('_surf', '_names', '_subs', '__weakref__')
+
+
+
+    def __init__(self, file, alpha = True, size = None):
+
+        if not isinstance(file, str):
+            raise TypeError('Atlas(): o argumento "file" precisa ser string')
+
+        if not isinstance(alpha, bool):
+            raise TypeError('Atlas(): o argumento "alpha" precisa ser True ou False')
+
+        if size is not None:
+
+            if not isinstance(size, (list, tuple)):
+                raise TypeError('Atlas(): o argumento "size" precisa ser lista, tupla ou None')
+
+            if len(size) != 2:
+                raise ValueError('Atlas(): o argumento "size" precisa ter comprimento 2')
+
+            (w, h) = size
+
+            if not isinstance(w, int):
+                raise TypeError('Atlas(): o primeiro item do argumento "size" precisa ser inteiro')
+
+            if not isinstance(h, int):
+                raise TypeError('Atlas(): o segundo item do argumento "size" precisa ser inteiro')
+
+            if w <= 0:
+                raise ValueError('Atlas(): o primeiro item do argumento "size" precisa ser maior que 0')
+
+            if h <= 0:
+                raise ValueError('Atlas(): o segundo item do argumento "size" precisa ser maior que 0')
+
+        try:
+            surf = mindu.assets._load(file, alpha)
+
+        except:
+            raise mindu.Error('Atlas(): impossível carregar o arquivo "{}"'.format(file))
+
+        if size is None:
+            rects = self._parse(os.path.splitext(file)[0] + '.json')
+
+        else:
+            (width, height) = surf.get_size()
+            rects = []
+
+            for y in range(0, height - h + 1, h):
+                for x in range(0, width - w + 1, w):
+                    rects.append((len(rects), pygame.Rect(x, y, w, h)))
+
+        if not rects:
+            raise mindu.Error('Atlas(): nenhum quadro encontrado em "{}"'.format(file))
+
+        bounds = surf.get_rect()
+
+        for (name, rect) in rects:
+
+            if not bounds.contains(rect):
+                raise mindu.Error('Atlas(): o quadro "{}" está fora da imagem "{}"'.format(name, file))
+
+        self._surf = surf
+        self._names = [name for (name, rect) in rects]
+        self._subs = {name: surf.subsurface(rect) for (name, rect) in rects}
+
+        mindu.assets._track_atlas(self)
+
+
+
+    def _parse(self, file):
+
+        try:
+            with open(file, encoding = 'utf-8') as stream: data = json.load(stream)
+
+        except:
+            raise mindu.Error('Atlas(): impossível carregar o arquivo "{}"'.format(file))
+
+        frames = data.get('frames') if isinstance(data, dict) else None
+
+        # No formato de dicionário, os nomes são as chaves.
+        if isinstance(frames, dict):
+            frames = [(key, value) for (key, value) in frames.items()]
+
+        elif isinstance(frames, list):
+            frames = [(frame.get('filename') if isinstance(frame, dict) else None, frame) for frame in frames]
+
+        else:
+            raise mindu.Error('Atlas(): formato inválido no arquivo "{}"'.format(file))
+
+        rects = []
+
+        for (name, frame) in frames:
+
+            try:
+                area = frame['frame']
+                rect = pygame.Rect(area['x'], area['y'], area['w'], area['h'])
+                if not isinstance(name, str): raise ValueError(name)
+
+            except:
+                raise mindu.Error('Atlas(): formato inválido no arquivo "{}"'.format(file))
+
+            # Quadros rotacionados pelo empacotador não são suportados.
+            if frame.get('rotated', False):
+                raise mindu.Error('Atlas(): o quadro "{}" está rotacionado no arquivo "{}"'.format(name, file))
+
+            rects.append((name, rect))
+
+        return rects
+
+
+
+    def _convert(self, memo):
+
+        # As regiões dependem da surface inteira, então são recriadas a partir
+        # da surface convertida, e as antigas ficam associadas às novas para
+        # que os sprites que as usam também sejam atualizados.
+        surf = mindu.assets._converted(self._surf, memo)
+
+        if surf is self._surf: return
+
+        for (name, sub) in self._subs.items():
+            new = surf.subsurface(sub.get_offset(), sub.get_size())
+            memo[sub] = new
+            self._subs[name] = new
+
+        self._surf = surf
+
+
+
+    def get_names(self):
+        """
+        get_names() -> list
+
+        Obtém os nomes dos quadros do atlas, na ordem em que aparecem.
+        """
+
+        return self._names[:]
+
+
+
+    def get_size(self):
+        """
+        get_size() -> (int, int)
+
+        Obtém as dimensões da imagem inteira do atlas.
+        """
+
+        return self._surf.get_size()
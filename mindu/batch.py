@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017 José Falero.
+#
+# ﻿This file is part of Mindu.
+#
+# Mindu is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mindu is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mindu.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Author: José Falero <jzfalero.@gmail.com>.
+"""
+A classe Batch está definida aqui.
+"""
+
+import mindu
+
+
+
+class Batch(object):
+    """
+    Batch(sprites = (), key = None) -> Batch
+
+    Objeto para desenhar muitos sprites de uma só vez.
+
+    Desenhar o lote equivale a desenhar cada um dos seus sprites, na ordem em
+    que foram adicionados, mas todos os sprites que não são On-Screen Display
+    são enviados à tela numa única operação, em vez de um de cada vez. Isso
+    faz diferença quando há centenas ou milhares de sprites, como partículas.
+
+    O argumento "sprites" é uma sequência de sprites a serem adicionados ao
+    lote. São considerados sprites os objetos Image, Label e Animation.
+
+    O argumento "key" é um objeto chamável ou None. Se for um objeto chamável,
+    ele é chamado com cada sprite como argumento a cada desenho, e os sprites
+    são desenhados em ordem crescente dos valores retornados (de trás para a
+    frente). Por exemplo, "lambda sprite: sprite.bottom" desenha os sprites
+    mais abaixo na tela por cima dos demais.
+    """
+
+    __slots__ = ('_sprites', '_key')
+
+
+
+    def __init__(self, sprites = (), key = None):
+
+        if not isinstance(sprites, (list, tuple)):
+            raise TypeError('Batch(): o argumento "sprites" precisa ser lista ou tupla')
+
+        for sprite in sprites:
+
+            if not isinstance(sprite, mindu.Sprite):
+                raise TypeError('Batch(): o argumento "sprites" precisa conter apenas objetos Image, Label ou Animation')
+
+        if (key is not None) and (not callable(key)):
+            raise TypeError('Batch(): o argumento "key" precisa ser chamável ou None')
+
+        self._sprites = list(sprites)
+        self._key = key
+
+
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+
+    def __iter__(self):
+        return iter(self._sprites[:])
+
+
+
+    def __contains__(self, sprite):
+        return sprite in self._sprites
+
+
+
+    def add(self, sprite):
+        """
+        add(sprite) -> None
+
+        Adiciona um sprite ao fim do lote.
+
+        São considerados sprites os objetos Image, Label e Animation.
+        """
+
+        if not isinstance(sprite, mindu.Sprite):
+            raise TypeError('add(): o argumento "sprite" precisa ser um objeto Image, Label ou Animation')
+
+        self._sprites.append(sprite)
+
+
+
+    def remove(self, sprite):
+        """
+        remove(sprite) -> None
+
+        Remove um sprite do lote. Se o sprite não estiver no lote, nada
+        acontece.
+        """
+
+        if sprite in self._sprites: self._sprites.remove(sprite)
+
+
+
+    def clear(self):
+        """
+        clear() -> None
+
+        Remove todos os sprites do lote.
+        """
+
+        self._sprites.clear()
+
+
+
+    def get_key(self):
+        """
+        get_key() -> callable or None
+
+        Obtém o objeto chamável que define a ordem de desenho dos sprites.
+        """
+
+        return self._key
+
+
+
+    def set_key(self, key):
+        """
+        set_key(key) -> None
+
+        Define o objeto chamável que define a ordem de desenho dos sprites.
+
+        O argumento "key" é um objeto chamável, que recebe um sprite e retorna
+        um valor para ordená-lo, ou None, para que os sprites sejam desenhados
+        na ordem em que foram adicionados.
+        """
+
+        if (key is not None) and (not callable(key)):
+            raise TypeError('set_key(): o argumento "key" precisa ser chamável ou None')
+
+        self._key = key
+
+
+
+    def draw(self):
+        """
+        draw() -> None
+
+        Desenha todos os sprites do lote na tela.
+        """
+
+        if not mindu.loop._running:
+            raise mindu.Error('draw(): método chamado com o loop interno do Mindu parado')
+
+        sprites = self._sprites
+
+        if self._key is not None: sprites = sorted(sprites, key = self._key)
+
+        screen = mindu.screen
+        world = [sprite for sprite in sprites if not sprite._osd]
+
+        if screen._culling:
+            view = screen._view()
+            visible = [sprite for sprite in world if view.colliderect(sprite._rect)]
+            screen._culled += len(world) - len(visible)
+            world = visible
+
+        screen._drawn += len(world)
+
+        screen._osd += [(sprite._surf, sprite._rect) for sprite in sprites if sprite._osd]
+
+        if screen._deferred():
+            screen._world += [(sprite._surf, sprite._rect.copy()) for sprite in world]
+
+        else:
+            screen._surf.blits([(sprite._surf, sprite._rect) for sprite in world], False)
+
+        # As animações avançam depois de desenhadas, como no método draw()
+        # delas.
+        for sprite in sprites:
+            if isinstance(sprite, mindu.Animation): sprite._update()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017 José Falero.
+#
+# ﻿This file is part of Mindu.
+#
+# Mindu is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mindu is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mindu.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Author: José Falero <jzfalero.@gmail.com>.
+"""
+A classe Binding está definida aqui.
+"""
+
+
+
+class Binding(object):
+    """
+    Objeto para consultar um único símbolo de um dispositivo de entrada.
+
+    Você não deve instanciar esta classe diretamente; objetos Binding são
+    retornados pelo método bind() dos dispositivos de entrada.
+    """
+
+    __slots__ = ('_input', '_symbol', '_id')
+
+
+
+    def __init__(self, input, symbol, id):
+        self._input = input
+        self._symbol = symbol
+        self._id = id
+
+
+
+    def get_input(self):
+        """
+        get_input() -> Keyboard, Mouse ou Joystick
+
+        Obtém o dispositivo de entrada ao qual o símbolo pertence.
+        """
+
+        return self._input
+
+
+
+    def get_symbol(self):
+        """
+        get_symbol() -> str
+
+        Obtém o símbolo consultado.
+        """
+
+        return self._symbol
+
+
+
+    def ding(self):
+        """
+        ding() -> bool
+
+        Verifica se o símbolo tornou-se ocupado.
+        """
+
+        return self._id in self._input._dinged
+
+
+
+    def dong(self):
+        """
+        dong() -> bool
+
+        Verifica se o símbolo tornou-se desocupado.
+        """
+
+        return self._id in self._input._donged
+
+
+
+    def busy(self):
+        """
+        busy() -> bool
+
+        Verifica se o símbolo está ocupado.
+        """
+
+        return bool(self._input._busy[self._id])
+
+
+
+    def time(self):
+        """
+        time() -> int
+
+        Verifica há quantos milissegundos o símbolo está ocupado.
+        """
+
+        input = self._input
+
+        if not input._busy[self._id]: return 0
+
+        return int(input._clock - input._time[self._id])
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017 José Falero.
+#
+# ﻿This file is part of Mindu.
+#
+# Mindu is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mindu is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mindu.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Author: José Falero <jzfalero.@gmail.com>.
+"""
+A classe Group está definida aqui.
+"""
+
+import weakref
+import pygame
+import mindu
+
+
+
+class Group(object):
+    """
+    Group(sprites = (), cell = 64) -> Group
+
+    Objeto para verificar colisões entre muitos sprites de uma só vez.
+
+    Os sprites do grupo são indexados numa grade de células quadradas, de modo
+    que cada consulta só examina os sprites das células envolvidas, em vez de
+    todos eles. Os sprites avisam o grupo quando se movem, e cada consulta
+    reindexa apenas os que se moveram desde a consulta anterior.
+
+    O argumento "sprites" é uma sequência de sprites a serem adicionados ao
+    grupo. São considerados sprites os objetos Image, Label e Animation.
+
+    O argumento "cell" é um inteiro maior que 0 representando o tamanho, em
+    pixels, de cada célula da grade. O ideal é um valor próximo do tamanho dos
+    sprites do grupo.
+    """
+
+    __slots__ = ('__weakref__', '_cell', '_cells', '_sprites', '_moved')
+
+
+
+    def __init__(self, sprites = (), cell = 64):
+
+        if not isinstance(sprites, (list, tuple, set)):
+            raise TypeError('Group(): o argumento "sprites" precisa ser lista, tupla ou conjunto')
+
+        if not isinstance(cell, int):
+            raise TypeError('Group(): o argumento "cell" precisa ser inteiro')
+
+        if cell <= 0:
+            raise ValueError('Group(): o argumento "cell" precisa ser maior que 0')
+
+        self._cell = cell
+
+        # Sprites de cada célula, e o retângulo e as células de cada sprite na
+        # última vez em que foi indexado.
+        self._cells = {}
+        self._sprites = {}
+
+        # Sprites que se moveram desde a última reindexação.
+        self._moved = set()
+
+        for sprite in sprites:
+
+            if not isinstance(sprite, mindu.Sprite):
+                raise TypeError('Group(): o argumento "sprites" precisa conter apenas objetos Image, Label ou Animation')
+
+            self._insert(sprite)
+
+
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+
+    def __iter__(self):
+        return iter(list(self._sprites))
+
+
+
+    def __contains__(self, sprite):
+        return sprite in self._sprites
+
+
+
+    def _keys(self, rect):
+        (x, y, w, h) = rect
+
+        # Retângulos vazios nunca colidem com nada.
+        if (w <= 0) or (h <= 0): return ()
+
+        cell = self._cell
+
+        return tuple((cx, cy) for cx in range(x // cell, (x + w - 1) // cell + 1)
+                              for cy in range(y // cell, (y + h - 1) // cell + 1))
+
+
+
+    def _insert(self, sprite):
+        rect = tuple(sprite._rect)
+        keys = self._keys(rect)
+
+        for key in keys:
+            cell = self._cells.get(key)
+            if cell is None: self._cells[key] = {sprite}
+            else: cell.add(sprite)
+
+        self._sprites[sprite] = (rect, keys)
+
+        groups = getattr(sprite, '_groups', None)
+
+        if groups is None:
+            groups = sprite._groups = weakref.WeakSet()
+
+        groups.add(self)
+
+
+
+    def _discard(self, sprite):
+        (rect, keys) = self._sprites.pop(sprite)
+
+        for key in keys:
+            cell = self._cells[key]
+            cell.discard(sprite)
+            if not cell: del self._cells[key]
+
+        sprite._groups.discard(self)
+        self._moved.discard(sprite)
+
+
+
+    def _refresh(self):
+        moved = self._moved
+
+        while moved:
+            sprite = moved.pop()
+
+            # Um sprite pode ter voltado ao lugar em que foi indexado.
+            if sprite._rect == self._sprites[sprite][0]: continue
+
+            self._discard(sprite)
+            self._insert(sprite)
+
+
+
+    def _query(self, rect):
+        cells = self._cells
+        found = set()
+
+        for key in self._keys(rect):
+            cell = cells.get(key)
+            if cell is not None: found.update(cell)
+
+        return found
+
+
+
+    def add(self, sprite):
+        """
+        add(sprite) -> None
+
+        Adiciona um sprite ao grupo. Se o sprite já estiver no grupo, nada
+        acontece.
+
+        São considerados sprites os objetos Image, Label e Animation.
+        """
+
+        if not isinstance(sprite, mindu.Sprite):
+            raise TypeError('add(): o argumento "sprite" precisa ser um objeto Image, Label ou Animation')
+
+        if sprite not in self._sprites: self._insert(sprite)
+
+
+
+    def remove(self, sprite):
+        """
+        remove(sprite) -> None
+
+        Remove um sprite do grupo. Se o sprite não estiver no grupo, nada
+        acontece.
+        """
+
+        if sprite in self._sprites: self._discard(sprite)
+
+
+
+    def clear(self):
+        """
+        clear() -> None
+
+        Remove todos os sprites do grupo.
+        """
+
+        for sprite in self._sprites:
+            sprite._groups.discard(self)
+
+        self._cells.clear()
+        self._sprites.clear()
+        self._moved.clear()
+
+
+
+    def collide(self, sprite):
+        """
+        collide(sprite) -> list
+
+        Obtém uma lista com os sprites do grupo que colidem com o sprite dado,
+        sem ele próprio, em nenhuma ordem particular.
+
+        São considerados sprites os objetos Image, Label e Animation.
+        """
+
+        if not isinstance(sprite, mindu.Sprite):
+            raise TypeError('collide(): o argumento "sprite" precisa ser um objeto Image, Label ou Animation')
+
+        self._refresh()
+
+        rect = sprite._rect
+
+        return [other for other in self._query(rect) if (other is not sprite) and rect.colliderect(other._rect)]
+
+
+
+    def collide_group(self, group):
+        """
+        collide_group(group) -> list
+
+        Obtém uma lista com todos os pares (a, b) de sprites que colidem, sendo
+        "a" um sprite deste grupo e "b" um sprite do grupo dado, em nenhuma
+        ordem particular. Um sprite nunca forma par consigo mesmo.
+
+        O argumento "group" é um objeto Group, que pode ser este próprio grupo;
+        nesse caso, cada par aparece uma única vez.
+        """
+
+        if not isinstance(group, Group):
+            raise TypeError('collide_group(): o argumento "group" precisa ser um objeto Group')
+
+        self._refresh()
+        if group is not self: group._refresh()
+
+        pairs = []
+        seen = set()
+
+        for a in self._sprites:
+            rect = a._rect
+
+            for b in group._query(rect):
+
+                if (b is a) or (not rect.colliderect(b._rect)): continue
+
+                if group is self:
+                    if (b, a) in seen: continue
+                    seen.add((a, b))
+
+                pairs.append((a, b))
+
+        return pairs
+
+
+
+    def collide_point(self, point):
+        """
+        collide_point(point) -> list
+
+        Obtém uma lista com os sprites do grupo que contêm o ponto dado, em
+        nenhuma ordem particular.
+
+        O argumento "point" é um par de inteiros (x, y) representando as
+        coordenadas X e Y de um ponto.
+        """
+
+        if not isinstance(point, (list, tuple)):
+            raise TypeError('collide_point(): o argumento "point" precisa ser lista ou tupla')
+
+        if len(point) != 2:
+            raise ValueError('collide_point(): o argumento "point" precisa ter comprimento 2')
+
+        (x, y) = point
+
+        if not isinstance(x, int):
+            raise TypeError('collide_point(): o primeiro item do argumento "point" precisa ser inteiro')
+
+        if not isinstance(y, int):
+            raise TypeError('collide_point(): o segundo item do argumento "point" precisa ser inteiro')
+
+        self._refresh()
+
+        return [sprite for sprite in self._query((x, y, 1, 1)) if sprite._rect.collidepoint(point)]
+
+
+
+    def collide_rect(self, rect):
+        """
+        collide_rect(rect) -> list
+
+        Obtém uma lista com os sprites do grupo que colidem com o retângulo
+        dado, em nenhuma ordem particular.
+
+        O argumento "rect" é uma sequência de 4 inteiros (x, y, w, h)
+        representando as coordenadas X e Y do canto superior esquerdo, a
+        largura e a altura de um retângulo.
+        """
+
+        if not isinstance(rect, (list, tuple)):
+            raise TypeError('collide_rect(): o argumento "rect" precisa ser lista ou tupla')
+
+        if len(rect) != 4:
+            raise ValueError('collide_rect(): o argumento "rect" precisa ter comprimento 4')
+
+        for value in rect:
+
+            if not isinstance(value, int):
+                raise TypeError('collide_rect(): os itens do argumento "rect" precisam ser inteiros')
+
+        self._refresh()
+
+        rect = pygame.Rect(rect)
+
+        return [sprite for sprite in self._query(rect) if rect.colliderect(sprite._rect)]
@@ -22,27 +22,30 @@
 A classe Image está definida aqui.
 """
 
-import pygame
 import mindu
 
 
 
 class Image(mindu.Sprite):
     """
-    Image(file, alpha = True, osd = False, **position) -> Image
+    Image(file, alpha = True, osd = False, region = None, **position) -> Image
 
     Sprite para representar imagens.
 
     O argumento "file" é uma string representando o nome do arquivo de imagem a
     ser carregado. Os formatos de arquivo de imagem suportados são: JPEG, PNG,
-    GIF, BMP, PCX, TGA, TIF, LBM, PBM e XPM.
+    GIF, BMP, PCX, TGA, TIF, LBM, PBM e XPM. O argumento também pode ser um
+    objeto Atlas, e nesse caso a imagem é um dos quadros dele.
 
     O argumento "alpha" é True ou False, indicando se a imagem possui canal
-    alpha (transparência).
+    alpha (transparência). É ignorado se "file" for um objeto Atlas.
 
     O argumento "osd" é True ou False, indicando se a imagem é On-Screen
     Display.
 
+    O argumento "region" é o nome do quadro do atlas a ser usado. Só pode ser
+    usado, e precisa ser, se "file" for um objeto Atlas.
+
     Os argumentos de palavra-chave opcionais "**position" servem para posicionar
     a imagem em relação à tela. Os argumentos de palavra-chave válidos são:
 
@@ -67,35 +70,41 @@ class Image(mindu.Sprite):
 
 
 
-    def __init__(self, file, alpha = True, osd = False, **position):
+    def __init__(self, file, alpha = True, osd = False, region = None, **position):
 
-        if not isinstance(file, str):
-            raise TypeError('Image(): o argumento "file" precisa ser string')
+        if not isinstance(alpha, bool):
+            raise TypeError('Image(): o argumento "alpha" precisa ser True ou False')
 
-        try:
-            surface = pygame.image.load(file)
+        if isinstance(file, mindu.Atlas):
 
-        except:
-            raise mindu.Error('Image(): impossível carregar o arquivo "{}"'.format(file))
+            if region not in file._subs:
+                raise ValueError('Image(): quadro inexistente no atlas: "{}"'.format(region))
 
-        if not isinstance(alpha, bool):
-            raise TypeError('Image(): o argumento "alpha" precisa ser True ou False')
+            surf = file._subs[region]
 
-        if not isinstance(osd, bool):
-            raise TypeError('Image(): o argumento "osd" precisa ser True ou False')
+        elif not isinstance(file, str):
+            raise TypeError('Image(): o argumento "file" precisa ser string ou Atlas')
 
-        if alpha:
-            surf = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        elif region is not None:
+            raise ValueError('Image(): o argumento "region" só pode ser usado com um Atlas')
 
         else:
-            surf = pygame.Surface(surface.get_size())
 
-        surf.blit(surface, (0, 0))
+            try:
+                surf = mindu.assets._load(file, alpha)
+
+            except:
+                raise mindu.Error('Image(): impossível carregar o arquivo "{}"'.format(file))
+
+        if not isinstance(osd, bool):
+            raise TypeError('Image(): o argumento "osd" precisa ser True ou False')
 
         self._surf = surf
         self._rect = surf.get_rect()
         self._osd = osd
 
+        mindu.assets._track(self)
+
         for (key, value) in position.items():
 
             if key not in ('top', 'left', 'bottom', 'right', 'topleft',
@@ -121,6 +130,8 @@ class Image(mindu.Sprite):
         copy._rect = self._rect.copy()
         copy._osd = self._osd
 
+        mindu.assets._track(copy)
+
         return copy
 
 
@@ -145,10 +156,12 @@ class Image(mindu.Sprite):
             raise TypeError('flip(): o argumento "vbool" precisa ser True ou False')
 
         copy = object.__new__(Image)
-        copy._surf = pygame.transform.flip(self._surf, hbool, vbool)
+        copy._surf = mindu.assets._transform(self._surf, 'flip', (hbool, vbool))
         copy._rect = copy._surf.get_rect(center = self._rect.center)
         copy._osd = self._osd
 
+        mindu.assets._track(copy)
+
         return copy
 
 
@@ -184,14 +197,39 @@ class Image(mindu.Sprite):
             raise ValueError('resize(): o segundo item do argumento "size" precisa ser maior que 0')
 
         copy = object.__new__(Image)
-        copy._surf = pygame.transform.smoothscale(self._surf, size)
+        copy._surf = mindu.assets._transform(self._surf, 'resize', (w, h))
         copy._rect = copy._surf.get_rect(center = self._rect.center)
         copy._osd = self._osd
 
+        mindu.assets._track(copy)
+
         return copy
 
 
 
+    def bake_rotations(self, steps):
+        """
+        bake_rotations(steps) -> None
+
+        Pré-calcula as rotações da imagem em "steps" ângulos igualmente
+        espaçados, de modo que o método rotate() passe a apenas escolher a
+        rotação pré-calculada mais próxima do ângulo pedido, sem calcular nada.
+        Vale também para as cópias feitas pelo método copy().
+
+        O argumento "steps" é um inteiro maior que 0. Por exemplo, 72 resulta em
+        rotações de 5 em 5 graus.
+        """
+
+        if not isinstance(steps, int):
+            raise TypeError('bake_rotations(): o argumento "steps" precisa ser inteiro')
+
+        if steps <= 0:
+            raise ValueError('bake_rotations(): o argumento "steps" precisa ser maior que 0')
+
+        mindu.assets._bake(self._surf, steps)
+
+
+
     def rotate(self, angle):
         """
         rotate(angle) -> Image
@@ -199,17 +237,20 @@ class Image(mindu.Sprite):
         Cria uma cópia rotacionada da imagem.
 
         O argumento "angle" é um float representando quantos graus rotacionar a
-        cópia.
+        cópia. Se as rotações da imagem foram pré-calculadas com o método
+        bake_rotations(), a rotação pré-calculada mais próxima é usada.
         """
 
         if not isinstance(angle, float):
             raise TypeError('rotate(): o argumento "angle" precisa ser float')
 
         copy = object.__new__(Image)
-        copy._surf = pygame.transform.rotozoom(self._surf, -angle, 1.0)
+        copy._surf = mindu.assets._transform(self._surf, 'rotate', angle)
         copy._rect = copy._surf.get_rect(center = self._rect.center)
         copy._osd = self._osd
 
+        mindu.assets._track(copy)
+
         return copy
 
 
@@ -232,10 +273,12 @@ class Image(mindu.Sprite):
             raise ValueError('scale(): o argumento "scale" precisa ser maior que 0.0')
 
         copy = object.__new__(Image)
-        copy._surf = pygame.transform.rotozoom(self._surf, 0.0, scale)
+        copy._surf = mindu.assets._transform(self._surf, 'scale', scale)
         copy._rect = copy._surf.get_rect(center = self._rect.center)
         copy._osd = self._osd
 
+        mindu.assets._track(copy)
+
         return copy
 
 
@@ -37,20 +37,40 @@ class Input(object):
 
 
     def _update(self):
+
+        # Em vez de somar o tempo de cada símbolo ocupado a cada iteração, cada
+        # dispositivo tem um relógio, e self._time guarda o momento em que cada
+        # símbolo se tornou ocupado.
+        self._clock += mindu.loop._elapsed
+
         self._ding = []
         self._dong = []
 
-        for (id, bool) in enumerate(self._busy):
+        busy = bytes(self._busy)
+        old = bytes(self._old_busy)
 
-            if bool:
+        # Os estados são comparados de uma só vez; só os símbolos que mudaram,
+        # encontrados pelos bits do XOR entre os estados, são visitados.
+        if busy != old:
+            changed = (int.from_bytes(busy, 'little') ^
+                       int.from_bytes(old, 'little'))
 
-                if not self._old_busy[id]: self._ding.append(id)
+            while changed:
+                bit = changed & -changed
+                changed ^= bit
+                id = (bit.bit_length() - 1) // 8
 
-                else: self._time[id] += (1000 // mindu.loop._ips)
+                if busy[id]:
+                    self._ding.append(id)
+                    self._time[id] = self._clock
 
-            elif self._old_busy[id]:
-                self._dong.append(id)
-                self._time[id] = 0
+                else:
+                    self._dong.append(id)
+
+        # As listas guardam a ordem dos eventos; os conjuntos respondem aos
+        # métodos ding() e dong() sem percorrer as listas.
+        self._dinged = set(self._ding)
+        self._donged = set(self._dong)
 
         if self._on_ding is not None:
             for id in self._ding:
@@ -64,6 +84,55 @@ class Input(object):
 
 
 
+    def _feed(self, changes):
+
+        # Alternativa a _update() para dispositivos movidos a eventos: em vez de
+        # comparar estados inteiros, aplica apenas as transições dadas, uma
+        # lista de tuplas (id, ocupado) na ordem em que aconteceram. Transições
+        # que não mudam o estado do símbolo são ignoradas.
+        self._clock += mindu.loop._elapsed
+
+        self._ding = []
+        self._dong = []
+
+        applied = []
+
+        for (id, busy) in changes:
+
+            if busy:
+
+                if self._busy[id]: continue
+
+                self._busy[id] = 1
+                self._time[id] = self._clock
+                self._ding.append(id)
+
+            else:
+
+                if not self._busy[id]: continue
+
+                self._busy[id] = 0
+                self._dong.append(id)
+
+            applied.append((id, busy))
+
+        self._dinged = set(self._ding)
+        self._donged = set(self._dong)
+
+        # Os objetos chamáveis são chamados na ordem real das transições, e não
+        # primeiro todos os ding e depois todos os dong.
+        for (id, busy) in applied:
+            symbol = self._symbols.get(id, 'unknow symbol')
+
+            if busy:
+                if self._on_ding is not None:
+                    self._on_ding(symbol, *self._on_ding_pargs, **self._on_ding_kwargs)
+
+            elif self._on_dong is not None:
+                self._on_dong(symbol, *self._on_dong_pargs, **self._on_dong_kwargs)
+
+
+
     def get_symbols(self):
         """
         get_symbols() -> tuple
@@ -92,7 +161,7 @@ class Input(object):
         if symbol not in self._symbols:
             raise ValueError('ding(): símbolo inválido: "{}"'.format(symbol))
 
-        return self._symbols[symbol] in self._ding
+        return self._symbols[symbol] in self._dinged
 
 
 
@@ -113,7 +182,7 @@ class Input(object):
         if symbol not in self._symbols:
             raise ValueError('dong(): símbolo inválido: "{}"'.format(symbol))
 
-        return self._symbols[symbol] in self._dong
+        return self._symbols[symbol] in self._donged
 
 
 
@@ -155,7 +224,34 @@ class Input(object):
         if symbol not in self._symbols:
             raise ValueError('time(): símbolo inválido: "{}"'.format(symbol))
 
-        return self._time[self._symbols[symbol]]
+        id = self._symbols[symbol]
+
+        if not self._busy[id]: return 0
+
+        return int(self._clock - self._time[id])
+
+
+
+    def bind(self, symbol):
+        """
+        bind(symbol) -> Binding
+
+        Obtém um objeto Binding para o símbolo dado. O símbolo é validado e
+        resolvido uma única vez, de modo que as consultas feitas pelo objeto
+        Binding a cada quadro são mais rápidas que as deste dispositivo.
+
+        O argumento "symbol" é uma string representando um símbolo do
+        dispositivo de entrada. Para conhecer os símbolos válidos, use o método
+        get_symbols().
+        """
+
+        if not isinstance(symbol, str):
+            raise TypeError('bind(): o argumento "symbol" precisa ser string')
+
+        if symbol not in self._symbols:
+            raise ValueError('bind(): símbolo inválido: "{}"'.format(symbol))
+
+        return mindu.Binding(self, symbol, self._symbols[symbol])
 
 
 
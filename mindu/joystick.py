@@ -33,9 +33,11 @@ class Joystick(mindu.Input):
     """
 
     __slots__ = ('_symbols', '_joy', '_name', '_numbuttons', '_numhats',
-                 '_numaxes', '_busy', '_old_busy', '_time', '_ding', '_dong',
-                 '_on_ding', '_on_ding_pargs', '_on_ding_kwargs', '_on_dong',
-                 '_on_dong_pargs', '_on_dong_kwargs')
+                 '_numaxes', '_busy', '_old_busy', '_time', '_clock', '_ding',
+                 '_dong', '_dinged', '_donged', '_on_ding', '_on_ding_pargs',
+                 '_on_ding_kwargs', '_on_dong', '_on_dong_pargs',
+                 '_on_dong_kwargs', '_instance', '_axes', '_values',
+                 '_deadzones', '_curves', '_thresholds')
 
 
 
@@ -51,6 +53,13 @@ class Joystick(mindu.Input):
         self._joy = pygame.joystick.Joystick(id)
         self._joy.init()
 
+        # Os eventos do Pygame 2 identificam o joystick pelo id de instância;
+        # os do Pygame 1, pelo índice do dispositivo.
+        if hasattr(self._joy, 'get_instance_id'):
+            self._instance = self._joy.get_instance_id()
+
+        else: self._instance = self._joy.get_id()
+
         # Alguns nomes de joystick possuem caracteres em branco bizarros.
         name = self._joy.get_name().split()
         self._name = ''
@@ -96,6 +105,9 @@ class Joystick(mindu.Input):
         for (key, value) in list(self._symbols.items()):
             self._symbols[value] = key
 
+        # Esta é a única leitura direta do estado do joystick; daqui em diante
+        # ele é mantido pelos eventos. Depois de reload_joysticks(), novos
+        # objetos Joystick são criados e lêem o estado de novo.
         buttons = [self._joy.get_button(b) for b in range(self._numbuttons)]
 
         hats = []
@@ -103,37 +115,94 @@ class Joystick(mindu.Input):
             (hx, hy) = self._joy.get_hat(h)
             hats += [hx < 0, hx > 0, hy > 0, hy < 0]
 
-        axes = []
+        # Valores brutos e processados dos eixos, e a configuração de cada um:
+        # zona morta, expoente da curva de resposta e limiares (ocupar,
+        # desocupar) dos símbolos digitais.
+        self._axes = [self._joy.get_axis(a) for a in range(self._numaxes)]
+        self._values = [0.0] * self._numaxes
+        self._deadzones = [0.1] * self._numaxes
+        self._curves = [1.0] * self._numaxes
+        self._thresholds = [(0.5, 0.25)] * self._numaxes
+
+        self._busy = buttons + hats + ([0] * (self._numaxes * 2))
+
         for a in range(self._numaxes):
-            a = self._joy.get_axis(a)
-            axes += [a < 0, a > 0]
+            for (i, busy) in self._axis(a): self._busy[i] = int(busy)
 
-        self._busy = buttons + hats + axes
         self._old_busy = self._busy
         self._time = [0] * len(self._busy)
+        self._clock = 0
         self._ding = []
         self._dong = []
+        self._dinged = set()
+        self._donged = set()
 
 
 
-    def _update(self):
-        self._old_busy = self._busy
+    def _update(self, events):
+        changes = []
 
-        buttons = [self._joy.get_button(b) for b in range(self._numbuttons)]
+        for event in events:
 
-        hats = []
-        for h in range(self._numhats):
-            hx, hy = self._joy.get_hat(h)
-            hats += [hx < 0, hx > 0, hy > 0, hy < 0]
+            if event.type == pygame.JOYBUTTONDOWN:
+                changes.append((event.button, 1))
+
+            elif event.type == pygame.JOYBUTTONUP:
+                changes.append((event.button, 0))
+
+            elif event.type == pygame.JOYHATMOTION:
+                i = self._numbuttons + (event.hat * 4)
+                (hx, hy) = event.value
+                changes += [(i, hx < 0), (i + 1, hx > 0),
+                            (i + 2, hy > 0), (i + 3, hy < 0)]
+
+            elif event.type == pygame.JOYAXISMOTION:
+                self._axes[event.axis] = event.value
+                changes += self._axis(event.axis)
+
+        self._feed(changes)
+
+
+
+    def _axis(self, axis):
+
+        # Calcula o valor processado do eixo dado e retorna as transições dos
+        # seus dois símbolos digitais. Entre os limiares de ocupar e de
+        # desocupar, cada símbolo mantém o estado que tinha, de modo que o ruído
+        # de um eixo parado perto de um limiar não gera ding e dong seguidos.
+        raw = self._axes[axis]
+        deadzone = self._deadzones[axis]
+        magnitude = abs(raw)
+
+        if magnitude <= deadzone: value = 0.0
+
+        else:
+            magnitude = min((magnitude - deadzone) / (1.0 - deadzone), 1.0)
+            magnitude **= self._curves[axis]
+            value = magnitude if (raw > 0) else -magnitude
+
+        self._values[axis] = value
+
+        (press, release) = self._thresholds[axis]
+        i = self._numbuttons + (self._numhats * 4) + (axis * 2)
+        transitions = []
+
+        for (id, magnitude) in ((i, -value), (i + 1, value)):
+
+            if magnitude >= press: transitions.append((id, 1))
+
+            elif magnitude < release: transitions.append((id, 0))
+
+        return transitions
 
-        axes = []
-        for a in range(self._numaxes):
-            a = self._joy.get_axis(a)
-            axes += [a < 0, a > 0]
 
-        self._busy = buttons + hats + axes
 
-        mindu.Input._update(self)
+    def _check_axis(self, method, axis):
+        if not isinstance(axis, int):
+            raise TypeError('{}(): o argumento "axis" precisa ser inteiro'.format(method))
+
+        if not (0 <= axis < self._numaxes):
+            raise ValueError('{}(): eixo inválido: "{}"'.format(method, axis))
 
 
 
@@ -148,3 +217,158 @@ class Joystick(mindu.Input):
 
 
 
+    def get_axis(self, axis):
+        """
+        get_axis(axis) -> float
+
+        Obtém o valor analógico do eixo dado, de -1.0 a 1.0, já com a zona morta
+        e a curva de resposta do eixo aplicadas.
+
+        O argumento "axis" é um inteiro representando o eixo, isto é, o "N" dos
+        símbolos "axis-N-minus" e "axis-N-plus".
+        """
+
+        self._check_axis('get_axis', axis)
+
+        return self._values[axis]
+
+
+
+    def get_deadzone(self, axis):
+        """
+        get_deadzone(axis) -> float
+
+        Obtém a zona morta do eixo dado.
+
+        O argumento "axis" é um inteiro representando o eixo.
+        """
+
+        self._check_axis('get_deadzone', axis)
+
+        return self._deadzones[axis]
+
+
+
+    def set_deadzone(self, axis, deadzone):
+        """
+        set_deadzone(axis, deadzone) -> None
+
+        Define a zona morta do eixo dado. Deslocamentos do eixo menores que a
+        zona morta são considerados 0.0, e o restante do curso é reescalado para
+        ir de 0.0 a 1.0.
+
+        O argumento "axis" é um inteiro representando o eixo.
+
+        O argumento "deadzone" é um float maior ou igual a 0.0 e menor que 1.0.
+        O padrão é 0.1.
+        """
+
+        self._check_axis('set_deadzone', axis)
+
+        if not isinstance(deadzone, float):
+            raise TypeError('set_deadzone(): o argumento "deadzone" precisa ser float')
+
+        if not (0.0 <= deadzone < 1.0):
+            raise ValueError('set_deadzone(): o argumento "deadzone" precisa ser maior ou igual a 0.0 e menor que 1.0')
+
+        # Os símbolos digitais do eixo só mudam no próximo evento do eixo.
+        self._deadzones[axis] = deadzone
+        self._axis(axis)
+
+
+
+    def get_curve(self, axis):
+        """
+        get_curve(axis) -> float
+
+        Obtém o expoente da curva de resposta do eixo dado.
+
+        O argumento "axis" é um inteiro representando o eixo.
+        """
+
+        self._check_axis('get_curve', axis)
+
+        return self._curves[axis]
+
+
+
+    def set_curve(self, axis, curve):
+        """
+        set_curve(axis, curve) -> None
+
+        Define o expoente da curva de resposta do eixo dado. Depois de aplicada
+        a zona morta, o deslocamento do eixo é elevado a este expoente: 1.0
+        resulta numa resposta linear, e valores maiores dão mais precisão perto
+        do centro.
+
+        O argumento "axis" é um inteiro representando o eixo.
+
+        O argumento "curve" é um float maior que 0.0. O padrão é 1.0.
+        """
+
+        self._check_axis('set_curve', axis)
+
+        if not isinstance(curve, float):
+            raise TypeError('set_curve(): o argumento "curve" precisa ser float')
+
+        if curve <= 0.0:
+            raise ValueError('set_curve(): o argumento "curve" precisa ser maior que 0.0')
+
+        # Os símbolos digitais do eixo só mudam no próximo evento do eixo.
+        self._curves[axis] = curve
+        self._axis(axis)
+
+
+
+    def get_threshold(self, axis):
+        """
+        get_threshold(axis) -> tuple
+
+        Obtém os limiares dos símbolos digitais do eixo dado, como uma tupla
+        (press, release).
+
+        O argumento "axis" é um inteiro representando o eixo.
+        """
+
+        self._check_axis('get_threshold', axis)
+
+        return self._thresholds[axis]
+
+
+
+    def set_threshold(self, axis, press, release):
+        """
+        set_threshold(axis, press, release) -> None
+
+        Define os limiares dos símbolos digitais do eixo dado. Os símbolos
+        "axis-N-minus" e "axis-N-plus" tornam-se ocupados quando o valor
+        analógico do eixo, em módulo, chega a "press", e só tornam-se
+        desocupados quando fica abaixo de "release". Entre os dois limiares, o
+        estado não muda, o que evita ding e dong repetidos causados pelo ruído
+        do eixo.
+
+        O argumento "axis" é um inteiro representando o eixo.
+
+        Os argumentos "press" e "release" são floats, sendo "press" maior que
+        0.0 e menor ou igual a 1.0, e "release" maior que 0.0 e menor ou igual
+        a "press". O padrão é (0.5, 0.25).
+        """
+
+        self._check_axis('set_threshold', axis)
+
+        if not isinstance(press, float):
+            raise TypeError('set_threshold(): o argumento "press" precisa ser float')
+
+        if not isinstance(release, float):
+            raise TypeError('set_threshold(): o argumento "release" precisa ser float')
+
+        if not (0.0 < press <= 1.0):
+            raise ValueError('set_threshold(): o argumento "press" precisa ser maior que 0.0 e menor ou igual a 1.0')
+
+        if not (0.0 < release <= press):
+            raise ValueError('set_threshold(): o argumento "release" precisa ser maior que 0.0 e menor ou igual a "press"')
+
+        self._thresholds[axis] = (press, release)
+
+
+
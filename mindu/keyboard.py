@@ -22,6 +22,7 @@
 A classe Keyboard está definida aqui.
 """
 
+import collections
 import pygame
 import mindu
 
@@ -32,9 +33,10 @@ class Keyboard(mindu.Input):
     Objeto para lidar com o teclado.
     """
 
-    __slots__ = ('_symbols', '_busy', '_old_busy', '_time', '_ding', '_dong',
-                 '_on_ding', '_on_ding_pargs', '_on_ding_kwargs', '_on_dong',
-                 '_on_dong_pargs', '_on_dong_kwargs')
+    __slots__ = ('_symbols', '_busy', '_old_busy', '_time', '_clock', '_ding',
+                 '_dong', '_dinged', '_donged', '_on_ding', '_on_ding_pargs',
+                 '_on_ding_kwargs', '_on_dong', '_on_dong_pargs',
+                 '_on_dong_kwargs', '_backend')
 
 
 
@@ -51,10 +53,16 @@ class Keyboard(mindu.Input):
         self._old_busy = self._busy
 
         self._time = [0] * len(self._busy)
+        self._clock = 0
 
         self._ding = []
         self._dong = []
 
+        self._dinged = set()
+        self._donged = set()
+
+        self._backend = 'polling'
+
         self._symbols = {}
 
         for attr in [attr for attr in dir(pygame) if attr.startswith('K_')]:
@@ -71,10 +79,104 @@ class Keyboard(mindu.Input):
 
 
     def _update(self):
+
+        if self._backend == 'polling':
+            self._old_busy = self._busy
+            self._busy = pygame.key.get_pressed()
+
+            mindu.Input._update(self)
+
+        else:
+            changes = []
+
+            for event in mindu.loop._events:
+
+                if event.type == pygame.KEYDOWN: changes.append((event.key, 1))
+
+                elif event.type == pygame.KEYUP: changes.append((event.key, 0))
+
+            self._feed(changes)
+
+
+
+    def _allow(self):
+        types = (pygame.KEYDOWN, pygame.KEYUP)
+
+        if self._backend == 'events':
+            pygame.event.set_allowed(types)
+
+        else:
+            pygame.event.set_blocked(types)
+
+
+
+    def _resync(self):
+        pressed = pygame.key.get_pressed()
+
+        # As teclas já pressionadas contam como pressionadas a partir de agora.
+        if self._backend == 'polling':
+            self._busy = pressed
+            self._time = [self._clock] * len(pressed)
+
+        else:
+            self._busy = collections.defaultdict(int)
+            self._time = {}
+
+            for id in self._symbols:
+
+                if isinstance(id, int) and pressed[id]:
+                    self._busy[id] = 1
+                    self._time[id] = self._clock
+
         self._old_busy = self._busy
-        self._busy = pygame.key.get_pressed()
 
-        mindu.Input._update(self)
+        self._ding = []
+        self._dong = []
+        self._dinged = set()
+        self._donged = set()
+
+
+
+    def get_backend(self):
+        """
+        get_backend() -> str
+
+        Obtém a forma como o estado do teclado é obtido.
+        """
+
+        return self._backend
+
+
+
+    def set_backend(self, backend):
+        """
+        set_backend(backend) -> None
+
+        Define a forma como o estado do teclado é obtido.
+
+        No modo "polling", o estado de todas as teclas é lido a cada passo do
+        loop, e uma tecla pressionada e solta entre dois passos passa
+        despercebida. No modo "events", apenas as teclas que mudaram de estado
+        são atualizadas, a partir dos eventos do Pygame: nenhuma transição é
+        perdida, e os objetos chamáveis registrados com os métodos on_ding() e
+        on_dong() são chamados na ordem em que as transições aconteceram. Uma
+        tecla pressionada e solta num mesmo passo é reportada tanto pelo método
+        ding() quanto pelo método dong().
+
+        O argumento "backend" é "polling" ou "events". O padrão é "polling".
+        """
+
+        if not isinstance(backend, str):
+            raise TypeError('set_backend(): o argumento "backend" precisa ser string')
+
+        if backend not in ('polling', 'events'):
+            raise ValueError('set_backend(): o argumento "backend" precisa ser "polling" ou "events"')
+
+        if backend == self._backend: return
+
+        self._backend = backend
+        self._allow()
+        self._resync()
 
 
 
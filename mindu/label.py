@@ -91,7 +91,11 @@ class Label(mindu.Sprite):
 
     __slots__ = ('_text', '_font', '_pygame_font', '_size', '_color',
                  '_ints_color', '_alignment', '_italic', '_bold', '_underline',
-                 '_osd', '_surf', '_rect')
+                 '_osd', '_surf', '_rect', '_font_key', '_misses')
+
+    # Falhas seguidas no cache de renderizações a partir das quais o rótulo
+    # deixa de guardar nele o que renderiza.
+    _miss_limit = 8
 
 
 
@@ -120,7 +124,7 @@ class Label(mindu.Sprite):
             raise TypeError('Label(): o argumento "font" precisa ser string ou None')
 
         try:
-            pygame_font = pygame.font.Font(font, size)
+            pygame_font = mindu.assets._font(font, size)
 
         except:
             raise mindu.Error('Label(): impossível carregar o arquivo "{}"'.format(font))
@@ -187,6 +191,8 @@ class Label(mindu.Sprite):
         self._text = text
         self._font = font
         self._pygame_font = pygame_font
+        self._font_key = mindu.assets._font_key(font, size)
+        self._misses = 0
         self._size = size
         self._color = color
         self._ints_color = ints_color
@@ -196,15 +202,13 @@ class Label(mindu.Sprite):
         self._underline = underline
         self._osd = osd
 
-        self._pygame_font.set_italic(self._italic)
-        self._pygame_font.set_bold(self._bold)
-        self._pygame_font.set_underline(self._underline)
-
         self._surf = None
         self._rect = None
 
         self._render()
 
+        mindu.assets._track(self)
+
         for (key, value) in position.items():
 
             if key not in ('top', 'left', 'bottom', 'right', 'topleft',
@@ -219,41 +223,82 @@ class Label(mindu.Sprite):
 
 
     def _render(self):
+
+        # Rótulos que voltam a um estado já renderizado (por este ou por outro
+        # rótulo) reaproveitam a surface guardada no cache.
+        key = (self._text, self._font_key, self._ints_color, self._alignment,
+               self._italic, self._bold, self._underline)
+
+        surf = mindu.assets._rendered(key)
+
+        if surf is None:
+            surf = self._rasterize()
+
+            # Um rótulo cujo texto muda sem nunca se repetir (um cronômetro, por
+            # exemplo) só encheria o cache de entradas inúteis, então, depois
+            # de algumas falhas seguidas, deixa de guardar o que renderiza.
+            if self._misses < Label._miss_limit:
+                mindu.assets._keep_rendered(key, surf)
+
+            self._misses += 1
+
+        else: self._misses = 0
+
+        self._surf = surf
+
+        if self._rect is None: self._rect = self._surf.get_rect()
+        else: self._rect = self._surf.get_rect(center = self._rect.center)
+
+        self._mark()
+
+
+
+    def _rasterize(self):
+
+        # A fonte é compartilhada com outros rótulos, então o estilo é aplicado
+        # a ela só no momento de renderizar.
+        self._pygame_font.set_italic(self._italic)
+        self._pygame_font.set_bold(self._bold)
+        self._pygame_font.set_underline(self._underline)
+
         color = self._ints_color[:3]
         lines = self._text.split('\n')
         lines = [self._pygame_font.render(line, True, color) for line in lines]
 
-        width = max((line.get_width() for line in lines))
-        linesize = self._pygame_font.get_linesize()
-        height = linesize * len(lines)
+        # A fonte já guarda os glifos rasterizados, então o custo está nas
+        # surfaces intermediárias: com uma única linha, a própria linha
+        # renderizada é usada, sem ser copiada para outra surface.
+        if len(lines) == 1:
+            surf = lines[0]
+
+        else:
+            width = max((line.get_width() for line in lines))
+            linesize = self._pygame_font.get_linesize()
+            height = linesize * len(lines)
 
-        surf = pygame.Surface((width, height), pygame.SRCALPHA)
+            surf = pygame.Surface((width, height), pygame.SRCALPHA)
 
-        rect_position = {'top': 0}
+            rect_position = {'top': 0}
 
-        if self._alignment == 'center':
-            rect_position['centerx'] = width // 2
+            if self._alignment == 'center':
+                rect_position['centerx'] = width // 2
 
-        elif self._alignment == 'right':
-            rect_position['right'] = width
+            elif self._alignment == 'right':
+                rect_position['right'] = width
 
-        for line in lines:
-            rect = line.get_rect(**rect_position)
-            surf.blit(line, rect)
-            rect_position['top'] += linesize
+            for line in lines:
+                rect = line.get_rect(**rect_position)
+                surf.blit(line, rect)
+                rect_position['top'] += linesize
 
         surf = surf.subsurface(surf.get_bounding_rect())
 
+        # A transparência é subtraída diretamente, sem uma surface auxiliar, e
+        # só quando a cor não é opaca.
         alpha = 255 - self._ints_color[3]
-        alpha_surf = pygame.Surface(surf.get_size(), pygame.SRCALPHA)
-        alpha_surf.fill((0, 0, 0, alpha))
+        if alpha: surf.fill((0, 0, 0, alpha), None, pygame.BLEND_RGBA_SUB)
 
-        surf.blit(alpha_surf, (0, 0), None, pygame.BLEND_RGBA_SUB)
-
-        self._surf = surf
-
-        if self._rect is None: self._rect = self._surf.get_rect()
-        else: self._rect = self._surf.get_rect(center = self._rect.center)
+        return surf
 
 
 
@@ -314,17 +359,14 @@ class Label(mindu.Sprite):
             raise TypeError('set_font(): o argumento "font" precisa ser string ou None')
 
         try:
-            pygame_font = pygame.font.Font(font, self._size)
+            pygame_font = mindu.assets._font(font, self._size)
 
         except:
             raise mindu.Error('set_font(): impossível carregar o arquivo "{}"'.format(font))
 
         self._font = font
         self._pygame_font = pygame_font
-
-        self._pygame_font.set_italic(self._italic)
-        self._pygame_font.set_bold(self._bold)
-        self._pygame_font.set_underline(self._underline)
+        self._font_key = mindu.assets._font_key(font, self._size)
 
         self._render()
 
@@ -358,11 +400,8 @@ class Label(mindu.Sprite):
             raise ValueError('set_size(): o argumento "size" precisa ser maior que 0')
 
         self._size = size
-        self._pygame_font = pygame.font.Font(self._font, size)
-
-        self._pygame_font.set_italic(self._italic)
-        self._pygame_font.set_bold(self._bold)
-        self._pygame_font.set_underline(self._underline)
+        self._pygame_font = mindu.assets._font(self._font, size)
+        self._font_key = mindu.assets._font_key(self._font, size)
 
         self._render()
 
@@ -492,7 +531,6 @@ class Label(mindu.Sprite):
             raise TypeError('set_italic(): o argumento "italic" precisa ser True ou False')
 
         self._italic = italic
-        self._pygame_font.set_italic(italic)
 
         self._render()
 
@@ -533,7 +571,6 @@ class Label(mindu.Sprite):
             raise TypeError('set_bold(): o argumento "bold" precisa ser True ou False')
 
         self._bold = bold
-        self._pygame_font.set_bold(bold)
 
         self._render()
 
@@ -575,7 +612,6 @@ class Label(mindu.Sprite):
             raise TypeError('set_underline(): o argumento "underline" precisa ser True ou False')
 
         self._underline = underline
-        self._pygame_font.set_underline(underline)
 
         self._render()
 
@@ -603,7 +639,9 @@ class Label(mindu.Sprite):
 
         copy._text = self._text
         copy._font = self._font
-        copy._pygame_font = pygame.font.Font(self._font, self._size)
+        copy._pygame_font = self._pygame_font
+        copy._font_key = self._font_key
+        copy._misses = 0
         copy._size = self._size
         copy._color = self._color
         copy._ints_color = self._ints_color
@@ -613,13 +651,11 @@ class Label(mindu.Sprite):
         copy._underline = self._underline
         copy._osd = self._osd
 
-        copy._pygame_font.set_italic(self._italic)
-        copy._pygame_font.set_bold(self._bold)
-        copy._pygame_font.set_underline(self._underline)
-
         copy._surf = self._surf
         copy._rect = self._rect.copy()
 
+        mindu.assets._track(copy)
+
         return copy
 
 
@@ -637,6 +673,8 @@ class Label(mindu.Sprite):
         image._rect = self._rect.copy()
         image._osd = self._osd
 
+        mindu.assets._track(image)
+
         return image
 
 
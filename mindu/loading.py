@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017 José Falero.
+#
+# ﻿This file is part of Mindu.
+#
+# Mindu is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mindu is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mindu.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Author: José Falero <jzfalero.@gmail.com>.
+"""
+A classe Loading está definida aqui.
+"""
+
+import mindu
+
+
+
+class Loading(object):
+    """
+    Objeto para acompanhar um carregamento em segundo plano.
+
+    Você não deve instanciar esta classe diretamente; objetos Loading são
+    retornados pelo método preload() do objeto "mindu.assets".
+    """
+
+    __slots__ = ('_keys', '_failed')
+
+
+
+    def __init__(self, keys):
+        self._keys = keys
+
+        # Arquivos cuja decodificação falhou, na ordem em que as falhas foram
+        # descobertas.
+        self._failed = []
+
+
+
+    def done(self):
+        """
+        done() -> bool
+
+        Retorna True se todas as imagens já foram decodificadas, ou False caso
+        contrário. As imagens prontas são guardadas no cache a cada chamada.
+
+        Se a decodificação de alguma imagem tiver falhado, um erro é lançado, a
+        esta e a todas as chamadas seguintes. Os arquivos que falharam podem
+        ser consultados com o método get_failed().
+        """
+
+        for key in self._keys:
+
+            try: mindu.assets._claim(key)
+
+            except mindu.Error: self._failed.append(key[0])
+
+        if self._failed:
+            raise mindu.Error('done(): impossível carregar o arquivo "{}"'.format(self._failed[0]))
+
+        return self.progress() == 1.0
+
+
+
+    def get_failed(self):
+        """
+        get_failed() -> tuple
+
+        Obtém os caminhos dos arquivos cuja decodificação falhou, entre os que
+        já foram verificados pelo método done().
+        """
+
+        return tuple(self._failed)
+
+
+
+    def progress(self):
+        """
+        progress() -> float
+
+        Obtém a fração das imagens que já foram decodificadas, de 0.0 a 1.0.
+        """
+
+        if not self._keys: return 1.0
+
+        pending = mindu.assets._pending
+        done = 0
+
+        for key in self._keys:
+            future = pending.get(key)
+            if (future is None) or future.done(): done += 1
+
+        return done / len(self._keys)
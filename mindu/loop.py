@@ -22,6 +22,7 @@
 A classe Loop está definida aqui.
 """
 
+import heapq
 import pygame
 import mindu
 
@@ -33,7 +34,10 @@ class Loop(object):
     """
 
     __slots__ = ('_running', '_ips', '_on_iterate', '_on_iterate_pargs',
-                 '_on_iterate_kwargs')
+                 '_on_iterate_kwargs', '_ups', '_max_updates', '_on_update',
+                 '_on_update_pargs', '_on_update_kwargs', '_elapsed', '_steps',
+                 '_alpha', '_tasks', '_iteration', '_order', '_profiler',
+                 '_profile', '_events')
 
 
 
@@ -44,6 +48,36 @@ class Loop(object):
         self._on_iterate_pargs = ()
         self._on_iterate_kwargs = {}
 
+        # Passo fixo: quando self._ups não é None, a simulação (entrada e
+        # on_update) roda self._ups vezes por segundo, independentemente da
+        # taxa de iterações, que passa a valer apenas para a renderização.
+        self._ups = None
+        self._max_updates = 5
+        self._on_update = None
+        self._on_update_pargs = ()
+        self._on_update_kwargs = {}
+
+        # Milissegundos simulados no passo atual, quantidade de passos rodados
+        # na iteração atual e fração de passo acumulada para interpolação.
+        self._elapsed = 1000 // self._ips
+        self._steps = 1
+        self._alpha = 1.0
+
+        # Tarefas agendadas, num heap de tuplas (iteração, -prioridade, ordem,
+        # tarefa). A cada iteração, apenas as tarefas vencidas são retiradas.
+        self._tasks = []
+        self._iteration = 0
+        self._order = 0
+
+        # O medidor guarda as amostras mesmo desligado; self._profile só
+        # aponta para ele enquanto a medição está ligada, para que as fases do
+        # loop paguem apenas um teste contra None quando ela está desligada.
+        self._profiler = mindu.Profiler()
+        self._profile = None
+
+        # Eventos retirados da fila no passo atual.
+        self._events = []
+
 
 
     def start(self):
@@ -61,24 +95,68 @@ class Loop(object):
 
         mindu.screen._create()
 
+        # A primeira iteração conta como se tivesse durado exatamente o tempo
+        # nominal de um passo.
+        elapsed = 1000 // self._ips
+        accumulator = None
+
+        if self._profile: self._profile._begin()
+
         try:
             while True:
-                mindu.keyboard._update()
-                mindu.mouse._update()
 
-                pygame.event.get(pygame.JOYAXISMOTION)
-                pygame.event.get(pygame.JOYHATMOTION)
-                pygame.event.get(pygame.JOYBUTTONUP)
-                pygame.event.get(pygame.JOYBUTTONDOWN)
+                if self._ups is None:
+                    accumulator = None
+                    self._elapsed = elapsed
+                    self._steps = 1
+                    self._alpha = 1.0
+                    self._step()
 
-                for joystick in mindu.joysticks: joystick._update()
+                else:
+                    step = 1000 / self._ups
+
+                    if accumulator is None: accumulator = step
+                    else: accumulator += elapsed
+
+                    self._elapsed = step
+                    self._steps = 0
+
+                    while (accumulator >= step) and (self._steps < self._max_updates):
+                        self._step()
+                        accumulator -= step
+                        self._steps += 1
+
+                    # Atingido o limite de passos por iteração, o atraso que
+                    # sobra é descartado em vez de acumulado indefinidamente.
+                    if accumulator >= step: accumulator %= step
+
+                    self._alpha = accumulator / step
 
                 if self._on_iterate is not None:
                     self._on_iterate(*self._on_iterate_pargs, **self._on_iterate_kwargs)
 
+                profile = self._profile
+
+                if profile: profile._mark('iterate')
+
+                if self._tasks and (self._tasks[0][0] <= self._iteration):
+                    self._run_tasks()
+
+                    if profile: profile._mark('tasks')
+
+                self._iteration += 1
+
+                if profile and (profile._label is not None):
+                    profile._label.draw()
+                    profile._mark('overlay')
+
                 mindu.screen._update()
 
-                tick(self._ips)
+                elapsed = tick(self._ips)
+
+                if profile:
+                    profile._mark('tick')
+                    profile._end()
 
         except Stop: pass
 
@@ -89,6 +167,97 @@ class Loop(object):
 
 
 
+    def _step(self):
+        profile = self._profile
+
+        # A fila é esvaziada de uma só vez, pois pedir os eventos por tipo não
+        # preserva a ordem em que aconteceram. Os dispositivos procuram os seus
+        # eventos em self._events. O evento QUIT volta para a fila, já que é
+        # tratado pela tela a cada iteração.
+        self._events = pygame.event.get()
+
+        for event in self._events:
+            if event.type == pygame.QUIT: pygame.event.post(event)
+
+        if profile: profile._mark('events')
+
+        mindu.keyboard._update()
+
+        if profile: profile._mark('keyboard')
+
+        mindu.mouse._update()
+
+        if profile: profile._mark('mouse')
+
+        # Os eventos dos joysticks são entregues a cada um conforme o id de
+        # instância, em vez de todos os controles serem lidos a cada passo.
+        routed = {}
+
+        for event in self._events:
+
+            if event.type in (pygame.JOYAXISMOTION, pygame.JOYHATMOTION,
+                              pygame.JOYBUTTONUP, pygame.JOYBUTTONDOWN):
+
+                instance = getattr(event, 'instance_id', None)
+
+                if instance is None: instance = event.joy
+
+                routed.setdefault(instance, []).append(event)
+
+        for joystick in mindu.joysticks:
+            joystick._update(routed.get(joystick._instance, ()))
+
+        if profile: profile._mark('joystick')
+
+        if self._on_update is not None:
+            self._on_update(*self._on_update_pargs, **self._on_update_kwargs)
+
+            if profile: profile._mark('update')
+
+
+
+    def _run_tasks(self):
+        tasks = self._tasks
+        due = []
+
+        while tasks and (tasks[0][0] <= self._iteration):
+            due.append(heapq.heappop(tasks)[3])
+
+        # As tarefas periódicas são reagendadas antes de qualquer chamada, para
+        # que possam cancelar a si mesmas e para que não se percam se alguma
+        # chamada interromper o loop ou lançar uma exceção.
+        for task in due:
+            if task._alive and (task._rate is not None):
+                self._push(task, self._iteration + task._rate)
+
+        called = 0
+
+        try:
+            for task in due:
+                called += 1
+
+                if not task._alive: continue
+
+                if task._rate is None: task._alive = False
+
+                task._callable(*task._pargs, **task._kwargs)
+
+        finally:
+
+            # As tarefas únicas que ficaram sem ser chamadas voltam para o heap,
+            # vencidas, e são chamadas na próxima vez.
+            for task in due[called:]:
+                if task._alive and (task._rate is None):
+                    self._push(task, self._iteration)
+
+
+
+    def _push(self, task, iteration):
+        heapq.heappush(self._tasks, (iteration, -task._priority, self._order, task))
+        self._order += 1
+
+
+
     def stop(self):
         """
         stop() -> None
@@ -169,6 +338,303 @@ class Loop(object):
 
 
 
+    def schedule(self, rate, priority, callable, *pargs, **kwargs):
+        """
+        schedule(rate, priority, callable, *pargs, **kwargs) -> Task
+
+        Agenda o objeto chamável dado, para que seja chamado a cada N iterações
+        do loop, depois do objeto chamável registrado com o método on_iterate().
+        Diferentemente de on_iterate(), qualquer quantidade de tarefas pode
+        estar agendada ao mesmo tempo.
+
+        O argumento "rate" é um inteiro maior que 0, indicando a cada quantas
+        iterações o objeto chamável deve ser chamado.
+
+        O argumento "priority" é um inteiro. Tarefas chamadas numa mesma
+        iteração são chamadas em ordem decrescente de prioridade, e, entre
+        tarefas de mesma prioridade, na ordem em que foram agendadas.
+
+        O argumento "callable" é o objeto chamável a ser agendado.
+
+        Os argumentos posicionais e de palavra-chave opcionais "*pargs" e
+        "**kwargs" serão repassados ao objeto chamável a cada chamada.
+
+        Note que um objeto Task é retornado, e pode ser usado para cancelar a
+        tarefa.
+        """
+
+        if not isinstance(rate, int):
+            raise TypeError('schedule(): o argumento "rate" precisa ser inteiro')
+
+        if rate <= 0:
+            raise ValueError('schedule(): o argumento "rate" precisa ser maior que 0')
+
+        if not isinstance(priority, int):
+            raise TypeError('schedule(): o argumento "priority" precisa ser inteiro')
+
+        task = mindu.Task(callable, pargs, kwargs, priority, rate)
+        self._push(task, self._iteration + rate)
+
+        return task
+
+
+
+    def delay(self, iterations, priority, callable, *pargs, **kwargs):
+        """
+        delay(iterations, priority, callable, *pargs, **kwargs) -> Task
+
+        Agenda o objeto chamável dado, para que seja chamado uma única vez,
+        daqui a N iterações do loop.
+
+        O argumento "iterations" é um inteiro maior que 0, indicando daqui a
+        quantas iterações o objeto chamável deve ser chamado.
+
+        O argumento "priority" é um inteiro, com o mesmo significado que tem no
+        método schedule().
+
+        O argumento "callable" é o objeto chamável a ser agendado.
+
+        Os argumentos posicionais e de palavra-chave opcionais "*pargs" e
+        "**kwargs" serão repassados ao objeto chamável.
+
+        Note que um objeto Task é retornado, e pode ser usado para cancelar a
+        tarefa.
+        """
+
+        if not isinstance(iterations, int):
+            raise TypeError('delay(): o argumento "iterations" precisa ser inteiro')
+
+        if iterations <= 0:
+            raise ValueError('delay(): o argumento "iterations" precisa ser maior que 0')
+
+        if not isinstance(priority, int):
+            raise TypeError('delay(): o argumento "priority" precisa ser inteiro')
+
+        task = mindu.Task(callable, pargs, kwargs, priority, None)
+        self._push(task, self._iteration + iterations)
+
+        return task
+
+
+
+    def on_update(self, callable, *pargs, **kwargs):
+        """
+        on_update(callable, *pargs, **kwargs) -> callable
+
+        Registra o objeto chamável dado, para que seja chamado uma vez a cada
+        passo da simulação, logo depois de a entrada ser atualizada.
+
+        Normalmente há exatamente um passo por iteração do loop. Com uma taxa
+        de passos por segundo definida pelo método set_ups(), os passos passam
+        a rodar em ritmo fixo: zero, um ou mais passos por iteração, conforme o
+        tempo real decorrido. Nesse modo, a lógica do jogo e a leitura da
+        entrada devem ficar neste objeto chamável, enquanto o objeto registrado
+        com o método on_iterate() apenas desenha, uma vez por iteração.
+
+        O argumento "callable" é o objeto chamável a ser registrado. Pode ser
+        None, para que nenhum objeto chamável fique registrado.
+
+        Os argumentos posicionais e de palavra-chave opcionais "*pargs" e
+        "**kwargs" serão repassados ao objeto chamável a cada chamada.
+
+        Note que o mesmo objeto chamável dado é retornado de volta para
+        facilitar o uso deste método como um decorador.
+        """
+
+        self._on_update = callable
+        self._on_update_pargs = pargs
+        self._on_update_kwargs = kwargs
+
+        return callable
+
+
+
+    def get_ups(self):
+        """
+        get_ups() -> int ou None
+
+        Obtém a taxa de passos da simulação por segundo. Retorna None se a
+        simulação roda um passo por iteração.
+        """
+
+        return self._ups
+
+
+
+    def set_ups(self, ups):
+        """
+        set_ups(ups) -> None
+
+        Define a taxa de passos da simulação por segundo.
+
+        O argumento "ups" é um inteiro maior que 0. Também pode ser None, para
+        que a simulação rode um passo por iteração (o padrão).
+        """
+
+        if (ups is not None) and (not isinstance(ups, int)):
+            raise TypeError('set_ups(): o argumento "ups" precisa ser inteiro ou None')
+
+        if (ups is not None) and (ups <= 0):
+            raise ValueError('set_ups(): o argumento "ups" precisa ser maior que 0')
+
+        self._ups = ups
+
+
+
+    def get_max_updates(self):
+        """
+        get_max_updates() -> int
+
+        Obtém o número máximo de passos da simulação rodados numa mesma
+        iteração para compensar atrasos.
+        """
+
+        return self._max_updates
+
+
+
+    def set_max_updates(self, max_updates):
+        """
+        set_max_updates(max_updates) -> None
+
+        Define o número máximo de passos da simulação rodados numa mesma
+        iteração para compensar atrasos. O atraso que exceder esse limite é
+        descartado, e o jogo fica mais lento em vez de travar tentando
+        recuperar o tempo perdido.
+
+        O argumento "max_updates" é um inteiro maior que 0. O padrão é 5.
+        """
+
+        if not isinstance(max_updates, int):
+            raise TypeError('set_max_updates(): o argumento "max_updates" precisa ser inteiro')
+
+        if max_updates <= 0:
+            raise ValueError('set_max_updates(): o argumento "max_updates" precisa ser maior que 0')
+
+        self._max_updates = max_updates
+
+
+
+    def get_profiling(self):
+        """
+        get_profiling() -> bool
+
+        Verifica se o tempo gasto em cada fase das iterações está sendo medido.
+        """
+
+        return self._profile is not None
+
+
+
+    def set_profiling(self, profiling):
+        """
+        set_profiling(profiling) -> None
+
+        Define se o tempo gasto em cada fase das iterações deve ser medido. Use
+        o método get_profile() para obter as medições.
+
+        O argumento "profiling" é True ou False.
+        """
+
+        if not isinstance(profiling, bool):
+            raise TypeError('set_profiling(): o argumento "profiling" precisa ser True ou False')
+
+        if not profiling:
+            self._profile = None
+            return
+
+        if self._profile is None:
+            self._profile = self._profiler
+            self._profile._begin()
+
+
+
+    def toggle_profiling(self):
+        """
+        toggle_profiling() -> None
+
+        Define alternadamente se o tempo gasto em cada fase das iterações deve
+        ser medido.
+        """
+
+        self.set_profiling(self._profile is None)
+
+
+
+    def get_profile(self):
+        """
+        get_profile() -> dict
+
+        Obtém as medições do tempo gasto em cada fase das últimas iterações
+        medidas (até 240).
+
+        As chaves do dicionário são os nomes das fases: "keyboard", "mouse",
+        "events", "joystick", "update", "iterate", "tasks", "world", "dirty",
+        "overlay", "compose", "bright", "zoom", "color", "osd", "cursor", "blit",
+        "flip", "clear", "replay", "tick" e "frame" (a iteração inteira). Apenas as fases
+        que de fato ocorreram estão presentes. Cada valor é um dicionário com as
+        chaves "mean", "p50", "p95", "p99" e "max", mapeadas para floats que
+        representam milissegundos.
+        """
+
+        return self._profiler._stats()
+
+
+
+    def get_profile_overlay(self):
+        """
+        get_profile_overlay() -> bool
+
+        Verifica se as medições das fases das iterações são exibidas na tela.
+        """
+
+        return self._profiler._label is not None
+
+
+
+    def set_profile_overlay(self, overlay):
+        """
+        set_profile_overlay(overlay) -> None
+
+        Define se as medições das fases das iterações são exibidas na tela,
+        enquanto a medição estiver ligada.
+
+        O argumento "overlay" é True ou False.
+        """
+
+        if not isinstance(overlay, bool):
+            raise TypeError('set_profile_overlay(): o argumento "overlay" precisa ser True ou False')
+
+        self._profiler._overlay(overlay)
+
+
+
+    def toggle_profile_overlay(self):
+        """
+        toggle_profile_overlay() -> None
+
+        Define alternadamente se as medições das fases das iterações são
+        exibidas na tela.
+        """
+
+        self.set_profile_overlay(self._profiler._label is None)
+
+
+
+    def get_alpha(self):
+        """
+        get_alpha() -> float
+
+        Obtém a fração de passo da simulação já decorrida e ainda não simulada,
+        entre 0.0 e 1.0, para interpolar posições ao desenhar entre o estado
+        anterior e o estado atual. Sem uma taxa de passos por segundo definida
+        pelo método set_ups(), é sempre 1.0.
+        """
+
+        return self._alpha
+
+
+
 
 class Stop(BaseException): pass
 
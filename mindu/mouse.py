@@ -33,10 +33,11 @@ class Mouse(mindu.Input):
     Objeto para lidar com o mouse.
     """
 
-    __slots__ = ('_symbols', '_busy', '_old_busy', '_time', '_ding', '_dong',
-                 '_on_ding', '_on_ding_pargs', '_on_ding_kwargs', '_on_dong',
-                 '_on_dong_pargs', '_on_dong_kwargs', '_position', '_visible',
-                 '_cursor', '_idle', '_idle_time', '_idle_timer')
+    __slots__ = ('_symbols', '_busy', '_old_busy', '_time', '_clock', '_ding',
+                 '_dong', '_dinged', '_donged', '_on_ding', '_on_ding_pargs',
+                 '_on_ding_kwargs', '_on_dong', '_on_dong_pargs',
+                 '_on_dong_kwargs', '_position', '_visible', '_cursor', '_idle',
+                 '_idle_time', '_idle_timer', '_backend')
 
 
 
@@ -53,10 +54,14 @@ class Mouse(mindu.Input):
         self._old_busy = self._busy
 
         self._time = [0] * len(self._busy)
+        self._clock = 0
 
         self._ding = []
         self._dong = []
 
+        self._dinged = set()
+        self._donged = set()
+
         self._symbols = {'button-left':0, 'button-middle':1, 'button-right':2,
                           'scroll-up':3, 'scroll-down':4, 'motion-left':5,
                           'motion-right':6, 'motion-up':7, 'motion-down':8,
@@ -69,16 +74,38 @@ class Mouse(mindu.Input):
         self._idle = False
         self._idle_time = 500
         self._idle_timer = 0
+        self._backend = 'polling'
 
         self.set_cursor(None)
 
 
 
     def _update(self):
+        position = self._position
+
+        if self._backend == 'polling': self._poll()
+
+        else: self._consume()
+
+        if position != self._position:
+            self._idle = False
+            self._idle_timer = 0
+
+        elif self._idle_timer < self._idle_time:
+            self._idle_timer += mindu.loop._elapsed
+
+            if self._idle_timer >= self._idle_time:
+                self._idle = True
+
+
+
+    def _poll(self):
         self._old_busy = self._busy
         self._busy = list(pygame.mouse.get_pressed() + (0, 0, 0, 0, 0, 0))
 
-        for event in pygame.event.get(pygame.MOUSEBUTTONDOWN):
+        for event in mindu.loop._events:
+
+            if event.type != pygame.MOUSEBUTTONDOWN: continue
 
             if event.button == 4: self._busy[3] = 1
 
@@ -89,9 +116,6 @@ class Mouse(mindu.Input):
 
         if position != self._position:
 
-            self._idle = False
-            self._idle_timer = 0
-
             (x1, y1) = position
             (x2, y2) = self._position
 
@@ -103,13 +127,82 @@ class Mouse(mindu.Input):
 
             elif y2 > y1: self._busy[8] = 1
 
-        elif self._idle_timer < self._idle_time:
-            self._idle_timer += (1000 // mindu.loop._ips)
+        mindu.Input._update(self)
 
-            if self._idle_timer >= self._idle_time:
-                self._idle = True
 
-        mindu.Input._update(self)
+
+    def _consume(self):
+        changes = []
+
+        # Rolagem e movimento não têm evento de término: ficam ocupados apenas
+        # nos passos em que acontecem, como no modo "polling".
+        pulses = set()
+
+        for event in mindu.loop._events:
+
+            if event.type == pygame.MOUSEMOTION:
+                self._position = event.pos
+                (dx, dy) = event.rel
+                ids = []
+
+                if dx < 0: ids.append(5)
+
+                elif dx > 0: ids.append(6)
+
+                if dy < 0: ids.append(7)
+
+                elif dy > 0: ids.append(8)
+
+            elif event.type not in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                continue
+
+            elif event.button in (4, 5):
+
+                if event.type == pygame.MOUSEBUTTONUP: continue
+
+                ids = [event.button - 1]
+
+            elif event.button in (1, 2, 3):
+                changes.append((event.button - 1, event.type == pygame.MOUSEBUTTONDOWN))
+                continue
+
+            else: continue
+
+            for id in ids:
+                pulses.add(id)
+                changes.append((id, 1))
+
+        # Os pulsos do passo anterior que não se repetiram terminam antes de
+        # qualquer transição deste passo.
+        ended = [(id, 0) for id in range(3, 9) if self._busy[id] and (id not in pulses)]
+
+        self._feed(ended + changes)
+
+
+
+    def _allow(self):
+        types = (pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+
+        if self._backend == 'events':
+            pygame.event.set_allowed(types)
+
+        else:
+            pygame.event.set_blocked(types)
+
+
+
+    def _resync(self):
+        self._busy = list(pygame.mouse.get_pressed() + (0, 0, 0, 0, 0, 0))
+        self._old_busy = self._busy
+
+        # Os botões já pressionados contam como pressionados a partir de agora.
+        self._time = [self._clock] * len(self._busy)
+        self._position = pygame.mouse.get_pos()
+
+        self._ding = []
+        self._dong = []
+        self._dinged = set()
+        self._donged = set()
 
 
 
@@ -271,3 +364,46 @@ class Mouse(mindu.Input):
 
 
 
+    def get_backend(self):
+        """
+        get_backend() -> str
+
+        Obtém a forma como o estado do mouse é obtido.
+        """
+
+        return self._backend
+
+
+
+    def set_backend(self, backend):
+        """
+        set_backend(backend) -> None
+
+        Define a forma como o estado do mouse é obtido.
+
+        No modo "polling", o estado dos botões e a posição do mouse são lidos a
+        cada passo do loop, e um clique feito entre dois passos passa
+        despercebido. No modo "events", apenas os botões que mudaram de estado
+        são atualizados, a partir dos eventos do Pygame: nenhuma transição é
+        perdida, e os objetos chamáveis registrados com os métodos on_ding() e
+        on_dong() são chamados na ordem em que as transições aconteceram. Um
+        botão pressionado e solto num mesmo passo é reportado tanto pelo método
+        ding() quanto pelo método dong().
+
+        O argumento "backend" é "polling" ou "events". O padrão é "polling".
+        """
+
+        if not isinstance(backend, str):
+            raise TypeError('set_backend(): o argumento "backend" precisa ser string')
+
+        if backend not in ('polling', 'events'):
+            raise ValueError('set_backend(): o argumento "backend" precisa ser "polling" ou "events"')
+
+        if backend == self._backend: return
+
+        self._backend = backend
+        self._allow()
+        self._resync()
+
+
+
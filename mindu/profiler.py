@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017 José Falero.
+#
+# ﻿This file is part of Mindu.
+#
+# Mindu is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mindu is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mindu.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Author: José Falero <jzfalero.@gmail.com>.
+"""
+A classe Profiler está definida aqui.
+"""
+
+import time
+import collections
+import mindu
+
+
+
+class Profiler(object):
+    """
+    Medidor do tempo gasto em cada fase das iterações do loop interno do Mindu.
+    """
+
+    __slots__ = ('_samples', '_current', '_start', '_last', '_ends', '_label')
+
+    # Quantidade de iterações guardadas por fase.
+    _size = 240
+
+    # A cada quantas iterações o texto da sobreposição na tela é atualizado.
+    _refresh = 30
+
+
+
+    def __init__(self):
+        self._samples = {}
+        self._current = {}
+        self._start = 0.0
+        self._last = 0.0
+        self._ends = 0
+        self._label = None
+
+
+
+    def _begin(self):
+        self._current = {}
+        self._start = self._last = time.perf_counter()
+
+
+
+    def _mark(self, phase):
+        now = time.perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+
+
+    def _end(self):
+        now = time.perf_counter()
+        self._current['frame'] = now - self._start
+
+        for (phase, seconds) in self._current.items():
+
+            if phase not in self._samples:
+                self._samples[phase] = collections.deque(maxlen = self._size)
+
+            self._samples[phase].append(seconds * 1000.0)
+
+        self._ends += 1
+
+        if (self._label is not None) and (not self._ends % self._refresh):
+            lines = ['{:<10}{:>8}{:>8}{:>8}'.format('ms', 'p50', 'p95', 'max')]
+
+            for (phase, stats) in sorted(self._stats().items()):
+                lines.append('{:<10}{:>8.2f}{:>8.2f}{:>8.2f}'.format(phase, stats['p50'], stats['p95'], stats['max']))
+
+            self._label.set_text('\n'.join(lines))
+
+        self._begin()
+
+
+
+    def _stats(self):
+        stats = {}
+
+        for (phase, samples) in self._samples.items():
+            ordered = sorted(samples)
+            last = len(ordered) - 1
+
+            stats[phase] = {'mean': sum(ordered) / len(ordered),
+                            'p50': ordered[int(last * 0.50)],
+                            'p95': ordered[int(last * 0.95)],
+                            'p99': ordered[int(last * 0.99)],
+                            'max': ordered[last]}
+
+        return stats
+
+
+
+    def _overlay(self, overlay):
+
+        if not overlay:
+            self._label = None
+            return
+
+        if self._label is None:
+            self._label = mindu.Label('...', None, 14, (1.0, 1.0, 0.0, 1.0), osd = True, topleft = (4, 4))
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017 José Falero.
+#
+# ﻿This file is part of Mindu.
+#
+# Mindu is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mindu is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mindu.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Author: José Falero <jzfalero.@gmail.com>.
+"""
+A classe Replay está definida aqui.
+"""
+
+import zlib
+import array
+import collections
+import pygame
+import mindu
+
+
+
+class Replay(object):
+    """
+    Histórico interno dos últimos quadros renderizados pela tela.
+    """
+
+    __slots__ = ('_length', '_compress', '_size', '_ring', '_index', '_count',
+                 '_shared', '_segments', '_last')
+
+    # Quantidade de quadros entre dois quadros-chave no modo comprimido.
+    _keyframe = 30
+
+
+
+    def __init__(self):
+        self._length = 0
+        self._compress = False
+        self._clear()
+
+
+
+    def _clear(self):
+
+        # Modo normal: um anel de surfaces reaproveitadas, sobrescritas no
+        # lugar a cada quadro.
+        self._ring = []
+        self._index = 0
+        self._count = 0
+
+        # Índices do anel cujas surfaces foram entregues a uma animação de
+        # replay e, portanto, não podem mais ser sobrescritas.
+        self._shared = set()
+
+        # Modo comprimido: segmentos formados por um quadro-chave comprimido,
+        # seguido, para cada quadro, das linhas que mudaram em relação ao
+        # quadro anterior, como pares (índices das linhas, linhas comprimidas).
+        self._segments = collections.deque()
+        self._last = None
+
+        self._size = None
+
+
+
+    def _resize(self, length):
+
+        if not length:
+            self._length = 0
+            self._clear()
+            return
+
+        if not self._compress:
+
+            # Só continuam compartilhadas as surfaces que já tinham sido
+            # entregues a uma animação de replay; as outras podem continuar
+            # sendo sobrescritas no lugar.
+            order = self._ordered_indices()[-length:]
+            self._ring = [self._ring[i] for i in order]
+            self._shared = {new for (new, old) in enumerate(order) if old in self._shared}
+            self._index = len(order) % length
+            self._count = len(order)
+
+        self._length = length
+
+        if self._compress: self._evict()
+
+
+
+    def _record(self, surf):
+
+        if surf.get_size() != self._size:
+            self._clear()
+            self._size = surf.get_size()
+
+        if self._compress:
+            self._record_compressed(surf)
+            return
+
+        i = self._index
+
+        if i == len(self._ring):
+            self._ring.append(surf.copy())
+
+        elif i in self._shared:
+            self._ring[i] = surf.copy()
+            self._shared.discard(i)
+
+        else:
+            self._ring[i].blit(surf, (0, 0))
+
+        self._index = (i + 1) % self._length
+
+        if self._count < self._length: self._count += 1
+
+
+
+    def _record_compressed(self, surf):
+        data = pygame.image.tostring(surf, 'RGB')
+
+        if (not self._segments) or (len(self._segments[-1]) == self._keyframe):
+            self._segments.append([zlib.compress(data, 1)])
+
+        else:
+
+            # As linhas são comparadas como fatias de bytes, em C; só as que
+            # mudaram são copiadas e comprimidas.
+            last = self._last
+            pitch = self._size[0] * 3
+            rows = array.array('H')
+            chunks = []
+
+            for start in range(0, len(data), pitch):
+                end = start + pitch
+                line = data[start:end]
+
+                if line != last[start:end]:
+                    rows.append(start // pitch)
+                    chunks.append(line)
+
+            self._segments[-1].append((rows, zlib.compress(b''.join(chunks), 1)))
+
+        self._last = data
+        self._count += 1
+
+        self._evict()
+
+
+
+    def _evict(self):
+
+        # Um segmento só é descartado quando todos os seus quadros já saíram
+        # do histórico, então até _keyframe - 1 quadros extras são mantidos.
+        while self._segments and (self._count - len(self._segments[0]) >= self._length):
+            self._count -= len(self._segments.popleft())
+
+
+
+    def _ordered_indices(self):
+        return list(range(self._index, len(self._ring))) + list(range(self._index))
+
+
+
+    def _ordered(self):
+        return self._ring[self._index:] + self._ring[:self._index]
+
+
+
+    def _frames(self):
+
+        if not self._count: return []
+
+        if self._compress:
+            segments = [segment[:] for segment in self._segments]
+            offset = max(self._count - self._length, 0)
+
+            return Frames(segments, offset, self._count - offset, self._size)
+
+        # As surfaces do anel passam a pertencer à animação; a partir de agora,
+        # cada posição do anel recebe uma surface nova ao ser sobrescrita.
+        self._shared = set(range(len(self._ring)))
+
+        return self._ordered()
+
+
+
+class Frames(object):
+    """
+    Sequência somente leitura de quadros de um replay comprimido, decodificados
+    sob demanda.
+    """
+
+    __slots__ = ('_segments', '_offset', '_length', '_size', '_cache_index',
+                 '_cache_data', '_cache_surf')
+
+
+
+    def __init__(self, segments, offset, length, size):
+        self._segments = segments
+        self._offset = offset
+        self._length = length
+        self._size = size
+        self._cache_index = -1
+        self._cache_data = None
+        self._cache_surf = None
+
+
+
+    def __len__(self):
+        return self._length
+
+
+
+    def __iter__(self):
+        for index in range(self._length): yield self[index]
+
+
+
+    def __getitem__(self, index):
+
+        if index < 0: index += self._length
+
+        if not (0 <= index < self._length):
+            raise IndexError('índice de quadro fora do intervalo')
+
+        if index == self._cache_index: return self._cache_surf
+
+        keyframe = Replay._keyframe
+        position = self._offset + index
+        (segment, step) = divmod(position, keyframe)
+
+        # Decodificando a partir do último quadro decodificado, se ele estiver
+        # no mesmo segmento e antes do quadro pedido, ou a partir do quadro-chave.
+        cached = self._offset + self._cache_index
+
+        if (self._cache_index >= 0) and (cached // keyframe == segment) and (cached < position):
+            data = self._cache_data
+            start = cached % keyframe + 1
+
+        else:
+            data = bytearray(zlib.decompress(self._segments[segment][0]))
+            start = 1
+
+        pitch = self._size[0] * 3
+
+        for (rows, chunks) in self._segments[segment][start:step + 1]:
+            chunks = zlib.decompress(chunks)
+
+            for (i, row) in enumerate(rows):
+                data[row * pitch:(row + 1) * pitch] = chunks[i * pitch:(i + 1) * pitch]
+
+        self._cache_index = index
+        self._cache_data = data
+        self._cache_surf = pygame.image.fromstring(bytes(data), self._size, 'RGB')
+
+        # Os quadros não passam pela conversão do cache, então são convertidos
+        # para o formato da tela aqui, se ela existir.
+        if mindu.assets._formats is not None:
+            self._cache_surf = self._cache_surf.convert()
+
+        return self._cache_surf
@@ -23,6 +23,7 @@ A classe Screen está definida aqui.
 """
 
 import os
+import collections
 import pygame
 import mindu
 
@@ -34,10 +35,14 @@ class Screen(object):
     """
 
     __slots__ = ('_title', '_icon', '_size', '_rect', '_zoom_rect', '_full',
-                 '_surf', '_osd', '_last_surf', '_bright_surf',
+                 '_display', '_surf', '_swap_surf', '_osd', '_last_surf',
+                 '_bright_surf',
                  '_subtraction_surf', '_red', '_green', '_blue', '_bright',
                  '_zoom', '_on_close', '_on_close_pargs', '_on_close_kwargs',
-                 '_replay', '_replay_length')
+                 '_replay', '_world', '_dirty',
+                 '_dirty_limit', '_dirty_old', '_dirty_state', '_culling',
+                 '_drawn', '_culled', '_cull_stats', '_zoom_mode',
+                 '_zoom_smooth', '_zoom_surf')
 
 
 
@@ -53,7 +58,12 @@ class Screen(object):
 
         self._full = False
 
+        # A cena é composta em self._surf, fora da tela, e então copiada para
+        # self._display. Duas surfaces se revezam nesse papel, para que o quadro
+        # anterior continue disponível em self._last_surf sem cópias extras.
+        self._display = None
         self._surf = None
+        self._swap_surf = None
         self._last_surf = None
         self._osd = []
 
@@ -73,24 +83,61 @@ class Screen(object):
         self._on_close_pargs = ()
         self._on_close_kwargs = {}
 
-        self._replay = []
-        self._replay_length = 0
+        self._replay = mindu.Replay()
+
+        # No modo de retângulos sujos, os sprites comuns não são desenhados
+        # imediatamente: ficam em self._world até o fim da iteração, quando
+        # apenas as regiões que mudaram são recompostas e enviadas à tela.
+        self._world = []
+        self._dirty = False
+        self._dirty_limit = 0.5
+        self._dirty_old = None
+        self._dirty_state = None
+
+        # Quando ligado, sprites comuns fora da área visível não são
+        # desenhados. As contagens da iteração atual ficam em self._drawn e
+        # self._culled, e as da iteração anterior, em self._cull_stats.
+        self._culling = False
+        self._drawn = 0
+        self._culled = 0
+        self._cull_stats = (0, 0)
+
+        # No modo de zoom "frame", o quadro inteiro é composto e então a região
+        # ampliada é redimensionada; no modo "camera", os sprites comuns ficam
+        # em self._world até o fim da iteração, quando são redimensionados um a
+        # um (com o cache de transformações) e desenhados já nas posições
+        # ampliadas. A surface auxiliar recebe o redimensionamento sem
+        # suavização, que não pode ser feito sobre a própria origem.
+        self._zoom_mode = 'frame'
+        self._zoom_smooth = True
+        self._zoom_surf = None
 
 
 
     def _create(self):
 
         if self._full:
-            self._surf = pygame.display.set_mode(self._size, pygame.FULLSCREEN)
+            self._display = pygame.display.set_mode(self._size, pygame.FULLSCREEN)
 
         else:
-            self._surf = pygame.display.set_mode(self._size)
+            self._display = pygame.display.set_mode(self._size)
 
-        self._last_surf = self._surf.copy()
+        self._surf = self._display.copy()
+        self._swap_surf = self._display.copy()
+        self._zoom_surf = self._display.copy()
+        self._last_surf = self._swap_surf
+        self._dirty_old = None
+
+        self._bright_surf = self._bright_surf.convert()
+        self._bright_surf.set_alpha(255 - int(self._bright * 255), pygame.RLEACCEL)
+        self._subtraction_surf = self._subtraction_surf.convert()
+
+        mindu.assets._convert()
 
 
 
     def _update(self):
+        profile = mindu.loop._profile
 
         if pygame.event.get(pygame.QUIT):
 
@@ -98,40 +145,255 @@ class Screen(object):
 
             else: self._on_close(*self._on_close_pargs, **self._on_close_kwargs)
 
-        if self._bright < 1.0: self._surf.blit(self._bright_surf, (0, 0))
+        if profile: profile._mark('events')
+
+        # O zoom redimensiona o quadro inteiro, então nenhuma região pode ser
+        # aproveitada de uma iteração para a outra.
+        if self._dirty and (self._zoom == 0.0): self._update_dirty(profile)
+
+        else: self._update_full(profile)
+
+        # As contagens só são fechadas depois da composição, pois o modo de
+        # zoom "camera" ainda descarta nela os sprites fora da área visível.
+        self._cull_stats = (self._drawn, self._culled)
+        self._drawn = 0
+        self._culled = 0
+
+        if self._replay._length:
+            self._replay._record(self._last_surf)
+
+            if profile: profile._mark('replay')
+
+
+
+    def _view(self):
+
+        # Com zoom, só a região ampliada aparece, e ela ainda será limitada à
+        # tela no fim da iteração.
+        if self._zoom > 0.0: return self._zoom_rect.clamp(self._rect)
+
+        return self._rect
+
+
 
+    def _deferred(self):
+
+        # Sprites comuns ficam para o fim da iteração no modo de retângulos
+        # sujos e no modo de zoom "camera".
+        return self._dirty or (self._zoom_mode == 'camera')
+
+
+
+    def _camera(self):
+        view = self._zoom_rect
+        (width, height) = self._size
+        operation = 'resize' if self._zoom_smooth else 'nearest'
+        blits = []
+        culled = 0
+
+        # As bordas de cada sprite são levadas para a tela separadamente, para
+        # que sprites vizinhos (como ladrilhos) continuem sem frestas entre si.
+        # Sprites fora da área visível nem chegam a ser redimensionados.
+        for (surf, rect) in self._world:
+
+            if not view.colliderect(rect):
+                culled += 1
+                continue
+
+            left = (rect.left - view.left) * width // view.width
+            top = (rect.top - view.top) * height // view.height
+            right = (rect.right - view.left) * width // view.width
+            bottom = (rect.bottom - view.top) * height // view.height
+
+            if (right <= left) or (bottom <= top): continue
+
+            scaled = mindu.assets._transform(surf, operation, (right - left, bottom - top))
+            blits.append((scaled, (left, top)))
+
+        self._drawn -= culled
+        self._culled += culled
+
+        return blits
+
+
+
+    def _update_full(self, profile):
         self._zoom_rect.clamp_ip(self._rect)
-        if self._zoom > 0.0:
+        camera = (self._zoom > 0.0) and (self._zoom_mode == 'camera')
+
+        if self._deferred():
+            self._surf.fill((0, 0, 0))
+            self._surf.blits(self._camera() if camera else self._world, False)
+            self._world = []
+
+            if profile: profile._mark('world')
+
+        if self._bright < 1.0: self._surf.blit(self._bright_surf, (0, 0))
+
+        if profile: profile._mark('bright')
+
+        if (self._zoom > 0.0) and (not camera):
             subsurf = self._surf.subsurface(self._zoom_rect)
-            pygame.transform.smoothscale(subsurf, self._size, self._surf)
+
+            if self._zoom_smooth:
+                pygame.transform.smoothscale(subsurf, self._size, self._surf)
+
+            else:
+                pygame.transform.scale(subsurf, self._size, self._zoom_surf)
+                self._surf.blit(self._zoom_surf, (0, 0))
+
+        if profile: profile._mark('zoom')
 
         if (self._red < 1.0) or (self._green < 1.0) or (self._blue < 1.0):
             self._surf.blit(self._subtraction_surf, (0, 0), None, pygame.BLEND_RGB_SUB)
 
-        for (surf, rect) in self._osd: self._surf.blit(surf, rect)
+        if profile: profile._mark('color')
+
+        self._surf.blits(self._osd, False)
         self._osd = []
 
+        if profile: profile._mark('osd')
+
         if mindu.mouse._visible: self._surf.blit(mindu.mouse._cursor._surf, mindu.mouse._position)
 
+        if profile: profile._mark('cursor')
+
+        self._display.blit(self._surf, (0, 0))
+
+        if profile: profile._mark('blit')
+
         pygame.display.flip()
 
-        self._last_surf = self._surf.copy()
+        if profile: profile._mark('flip')
+
+        # O quadro recém-composto passa a ser o último quadro, e a outra
+        # surface é limpa para receber o próximo.
+        self._last_surf = self._surf
+        (self._surf, self._swap_surf) = (self._swap_surf, self._surf)
+
+        if not self._dirty: self._surf.fill((0, 0, 0))
+
+        if profile: profile._mark('clear')
+
+        self._dirty_old = None
+
+
+
+    def _update_dirty(self, profile):
+        draws = self._world + self._osd
+
+        if mindu.mouse._visible:
+            cursor = mindu.mouse._cursor._surf
+            draws.append((cursor, cursor.get_rect(topleft = mindu.mouse._position)))
+
+        keys = [(surf, tuple(rect)) for (surf, rect) in draws]
+        state = (self._bright, self._red, self._green, self._blue)
+
+        if (self._dirty_old is None) or (state != self._dirty_state):
+            regions = [self._rect]
+
+        else:
+            regions = self._dirty_regions(keys)
+
+        if profile: profile._mark('dirty')
+
+        for region in regions:
+            self._surf.set_clip(region)
+            self._surf.fill((0, 0, 0))
+
+            self._surf.blits([draw for draw in self._world if region.colliderect(draw[1])], False)
+
+            if self._bright < 1.0: self._surf.blit(self._bright_surf, (0, 0))
 
-        if self._replay_length:
-            self._replay.append(self._last_surf)
+            if (self._red < 1.0) or (self._green < 1.0) or (self._blue < 1.0):
+                self._surf.blit(self._subtraction_surf, (0, 0), None, pygame.BLEND_RGB_SUB)
 
-            if len(self._replay) > self._replay_length:
-                self._replay.pop(0)
+            self._surf.blits([draw for draw in draws[len(self._world):] if region.colliderect(draw[1])], False)
 
-        self._surf.fill((0, 0, 0))
+            self._display.blit(self._surf, region, region)
+
+        self._surf.set_clip(None)
+
+        if profile: profile._mark('compose')
+
+        if regions and (regions[0] is self._rect): pygame.display.flip()
+
+        elif regions: pygame.display.update(regions)
+
+        if profile: profile._mark('flip')
+
+        # No modo de retângulos sujos a surface de composição é preservada entre
+        # as iterações, então ela mesma guarda o último quadro.
+        self._last_surf = self._surf
+
+        self._world = []
+        self._osd = []
+        self._dirty_old = keys
+        self._dirty_state = state
+
+
+
+    def _dirty_regions(self, keys):
+
+        # Um par (surface, posição) presente em apenas uma das duas iterações
+        # suja a sua área. Pares presentes nas duas, mas desenhados em outra
+        # ordem, também sujam, pois podem ter trocado de camada.
+        old = collections.Counter(self._dirty_old)
+        new = collections.Counter(keys)
+
+        rects = [pygame.Rect(rect) for (surf, rect) in (new - old).elements()]
+        rects += [pygame.Rect(rect) for (surf, rect) in (old - new).elements()]
+
+        index = {}
+        for (i, key) in enumerate(self._dirty_old): index.setdefault(key, i)
+
+        last = -1
+        for key in keys:
+            i = index.get(key)
+
+            if i is None: continue
+
+            if i < last: rects.append(pygame.Rect(key[1]))
+
+            else: last = i
+
+        regions = []
+        area = 0
+
+        for rect in rects:
+            rect = rect.clip(self._rect)
+
+            if not (rect.width and rect.height): continue
+
+            i = rect.collidelist(regions)
+
+            while i != -1:
+                rect.union_ip(regions.pop(i))
+                i = rect.collidelist(regions)
+
+            regions.append(rect)
+
+        for rect in regions: area += rect.width * rect.height
+
+        if area > (self._dirty_limit * self._rect.width * self._rect.height):
+            return [self._rect]
+
+        return regions
 
 
 
     def _destroy(self):
 
+        self._display = None
         self._surf = None
+        self._swap_surf = None
+        self._zoom_surf = None
         self._last_surf = None
         self._osd = []
+        self._world = []
+        self._dirty_old = None
+
+        mindu.assets._formats = None
 
         # Reinicializando o módulo display para destruir a tela.
         pygame.display.quit()
@@ -149,6 +411,8 @@ class Screen(object):
         pygame.event.set_allowed(pygame.JOYHATMOTION)
         pygame.event.set_allowed(pygame.JOYBUTTONUP)
         pygame.event.set_allowed(pygame.JOYBUTTONDOWN)
+        mindu.keyboard._allow()
+        mindu.mouse._allow()
 
 
 
@@ -993,6 +1257,7 @@ class Screen(object):
                   rect.centery - sprite._rect.centery)
 
         sprite._rect = rect
+        sprite._mark()
 
         return offset
 
@@ -1074,6 +1339,7 @@ class Screen(object):
                   rect.centery - sprite._rect.centery)
 
         sprite._rect = rect
+        sprite._mark()
 
         return offset
 
@@ -1252,10 +1518,14 @@ class Screen(object):
         if not mindu.loop._running: return
 
         if self._full:
-            self._surf = pygame.display.set_mode(self._size, pygame.FULLSCREEN)
+            self._display = pygame.display.set_mode(self._size, pygame.FULLSCREEN)
 
         else:
-            self._surf = pygame.display.set_mode(self._size)
+            self._display = pygame.display.set_mode(self._size)
+
+        self._dirty_old = None
+
+        mindu.assets._convert()
 
 
 
@@ -1270,6 +1540,242 @@ class Screen(object):
 
 
 
+    def get_dirty(self):
+        """
+        get_dirty() -> bool
+
+        Verifica se a tela usa o modo de retângulos sujos.
+        """
+
+        return self._dirty
+
+
+
+    def set_dirty(self, dirty):
+        """
+        set_dirty(dirty) -> None
+
+        Define se a tela usa o modo de retângulos sujos.
+
+        Nesse modo, a cada iteração apenas as regiões da tela onde algum sprite
+        mudou (apareceu, sumiu, se moveu ou trocou de quadro) são recompostas e
+        enviadas ao monitor. Partes estáticas da cena, como um plano de fundo,
+        deixam de custar trabalho a cada iteração. Quando a área suja ultrapassa
+        o limite definido com o método set_dirty_limit(), ou quando o zoom está
+        ativo, a tela inteira é redesenhada como no modo normal.
+
+        O argumento "dirty" é True ou False.
+        """
+
+        if not isinstance(dirty, bool):
+            raise TypeError('set_dirty(): o argumento "dirty" precisa ser True ou False')
+
+        self._dirty = dirty
+        self._dirty_old = None
+        self._flush()
+
+
+
+    def toggle_dirty(self):
+        """
+        toggle_dirty() -> None
+
+        Define alternadamente se a tela usa o modo de retângulos sujos.
+        """
+
+        self.set_dirty(not self._dirty)
+
+
+
+    def get_dirty_limit(self):
+        """
+        get_dirty_limit() -> float
+
+        Obtém a fração da área da tela a partir da qual o modo de retângulos
+        sujos redesenha a tela inteira.
+        """
+
+        return self._dirty_limit
+
+
+
+    def set_dirty_limit(self, limit):
+        """
+        set_dirty_limit(limit) -> None
+
+        Define a fração da área da tela a partir da qual o modo de retângulos
+        sujos redesenha a tela inteira.
+
+        O argumento "limit" é um float entre 0.0 e 1.0. O padrão é 0.5.
+        """
+
+        if not isinstance(limit, float):
+            raise TypeError('set_dirty_limit(): o argumento "limit" precisa ser float')
+
+        if (limit < 0.0) or (limit > 1.0):
+            raise ValueError('set_dirty_limit(): o argumento "limit" precisa estar entre 0.0 e 1.0')
+
+        self._dirty_limit = limit
+
+
+
+    def _flush(self):
+
+        # Ao deixar os modos que adiam os sprites comuns no meio de uma
+        # iteração, os que já foram desenhados vão direto para o quadro.
+        if self._deferred(): return
+
+        if self._surf is not None:
+            self._surf.fill((0, 0, 0))
+            self._surf.blits(self._world, False)
+
+        self._world = []
+
+
+
+    def get_zoom_mode(self):
+        """
+        get_zoom_mode() -> str
+
+        Obtém o modo de zoom da tela.
+        """
+
+        return self._zoom_mode
+
+
+
+    def set_zoom_mode(self, mode):
+        """
+        set_zoom_mode(mode) -> None
+
+        Define o modo de zoom da tela.
+
+        No modo "frame", o quadro inteiro é desenhado e então a região ampliada
+        é redimensionada para o tamanho da tela, a cada iteração. No modo
+        "camera", cada sprite comum é redimensionado separadamente e desenhado
+        já na posição ampliada. As cópias redimensionadas ficam no cache de
+        transformações, de modo que, enquanto o nível de zoom não muda, nada é
+        redimensionado de novo. Sprites On-Screen Display nunca são ampliados.
+
+        O argumento "mode" é "frame" ou "camera". O padrão é "frame".
+        """
+
+        if not isinstance(mode, str):
+            raise TypeError('set_zoom_mode(): o argumento "mode" precisa ser string')
+
+        if mode not in ('frame', 'camera'):
+            raise ValueError('set_zoom_mode(): o argumento "mode" precisa ser "frame" ou "camera"')
+
+        if mode == self._zoom_mode: return
+
+        self._zoom_mode = mode
+        self._flush()
+
+
+
+    def get_zoom_smooth(self):
+        """
+        get_zoom_smooth() -> bool
+
+        Verifica se o zoom usa redimensionamento suavizado.
+        """
+
+        return self._zoom_smooth
+
+
+
+    def set_zoom_smooth(self, smooth):
+        """
+        set_zoom_smooth(smooth) -> None
+
+        Define se o zoom usa redimensionamento suavizado. Sem suavização, os
+        pixels são apenas repetidos, o que é bem mais rápido e preserva o
+        aspecto de jogos com gráficos pixelados. O padrão é True.
+
+        O argumento "smooth" é True ou False.
+        """
+
+        if not isinstance(smooth, bool):
+            raise TypeError('set_zoom_smooth(): o argumento "smooth" precisa ser True ou False')
+
+        self._zoom_smooth = smooth
+
+
+
+    def toggle_zoom_smooth(self):
+        """
+        toggle_zoom_smooth() -> None
+
+        Define alternadamente se o zoom usa redimensionamento suavizado.
+        """
+
+        self.set_zoom_smooth(not self._zoom_smooth)
+
+
+
+    def get_culling(self):
+        """
+        get_culling() -> bool
+
+        Verifica se os sprites fora da área visível deixam de ser desenhados.
+        """
+
+        return self._culling
+
+
+
+    def set_culling(self, culling):
+        """
+        set_culling(culling) -> None
+
+        Define se os sprites fora da área visível deixam de ser desenhados.
+
+        A área visível é a tela inteira ou, com zoom, apenas a região ampliada,
+        no momento em que cada sprite é desenhado. Por isso, se o nível ou o
+        centro do zoom mudar depois que os sprites forem desenhados, numa mesma
+        iteração, sprites que deveriam aparecer podem ficar de fora daquele
+        quadro; nesse caso, mude o zoom antes de desenhar. Sprites On-Screen
+        Display são sempre desenhados. O padrão é False.
+
+        O argumento "culling" é True ou False.
+        """
+
+        if not isinstance(culling, bool):
+            raise TypeError('set_culling(): o argumento "culling" precisa ser True ou False')
+
+        self._culling = culling
+
+
+
+    def toggle_culling(self):
+        """
+        toggle_culling() -> None
+
+        Define alternadamente se os sprites fora da área visível deixam de ser
+        desenhados.
+        """
+
+        self.set_culling(not self._culling)
+
+
+
+    def get_culling_stats(self):
+        """
+        get_culling_stats() -> dict
+
+        Obtém quantos sprites comuns (não On-Screen Display) foram desenhados e
+        quantos foram descartados por estarem fora da área visível na última
+        iteração completa, num dicionário com as chaves "drawn" e "culled".
+
+        No modo de zoom "camera", os sprites fora da região ampliada também são
+        descartados na composição do quadro, mesmo com o descarte desligado, e
+        entram na contagem "culled".
+        """
+
+        return {'drawn': self._cull_stats[0], 'culled': self._cull_stats[1]}
+
+
+
     def set_size(self, size):
         """
         set_size(size) -> None
@@ -1362,8 +1868,10 @@ class Screen(object):
         if not mindu.loop._running:
             raise mindu.Error('get_last_frame(): método chamado com o loop interno do Mindu parado')
 
+        # A surface do último quadro será reaproveitada, então a imagem precisa
+        # da sua própria cópia.
         image = object.__new__(mindu.Image)
-        image._surf = self._last_surf
+        image._surf = self._last_surf.copy()
         image._rect = image._surf.get_rect()
         image._osd = False
 
@@ -1410,7 +1918,7 @@ class Screen(object):
         o método get_replay().
         """
 
-        return self._replay_length
+        return self._replay._length
 
 
 
@@ -1435,11 +1943,57 @@ class Screen(object):
         if length < 0:
             raise ValueError('set_replay_length(): o argumento "length" precisa ser maior ou igual a 0')
 
-        if not length: self._replay = []
+        self._replay._resize(length)
+
 
-        else: self._replay = self._replay[-length:]
 
-        self._replay_length = length
+    def get_replay_compress(self):
+        """
+        get_replay_compress() -> bool
+
+        Verifica se o histórico de quadros do replay é mantido comprimido.
+        """
+
+        return self._replay._compress
+
+
+
+    def set_replay_compress(self, compress):
+        """
+        set_replay_compress(compress) -> None
+
+        Define se o histórico de quadros do replay é mantido comprimido.
+
+        Comprimido, cada quadro é guardado como a diferença em relação ao
+        quadro anterior, o que permite replays de vários minutos em pouca
+        memória, ao custo de algum processamento a cada iteração. Os quadros
+        da animação obtida com o método get_replay() são descomprimidos sob
+        demanda, à medida que são exibidos.
+
+        Note que o histórico atual é descartado quando o modo muda.
+
+        O argumento "compress" é True ou False.
+        """
+
+        if not isinstance(compress, bool):
+            raise TypeError('set_replay_compress(): o argumento "compress" precisa ser True ou False')
+
+        if compress == self._replay._compress: return
+
+        self._replay._compress = compress
+        self._replay._clear()
+
+
+
+    def toggle_replay_compress(self):
+        """
+        toggle_replay_compress() -> None
+
+        Define alternadamente se o histórico de quadros do replay é mantido
+        comprimido.
+        """
+
+        self.set_replay_compress(not self._replay._compress)
 
 
 
@@ -1456,13 +2010,17 @@ class Screen(object):
         if not mindu.loop._running:
             raise mindu.Error('get_replay(): método chamado com o loop interno do Mindu parado')
 
-        if not self._replay:
+        surfs = self._replay._frames()
+
+        if not surfs:
             raise mindu.Error('get_replay(): nenhum frame no histórico')
 
+        (w, h) = self._replay._size
+
         animation = object.__new__(mindu.Animation)
 
-        animation._surfs = self._replay[:]
-        animation._rects = [surf.get_rect() for surf in animation._surfs]
+        animation._surfs = surfs
+        animation._rects = [pygame.Rect(0, 0, w, h) for index in range(len(surfs))]
 
         animation._redraw = 1
         animation._anchor = 'midbottom'
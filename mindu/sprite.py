@@ -31,7 +31,22 @@ class Sprite(object):
     Classe de base dos sprites.
     """
 
-    __slots__ = ()
+    # Os sprites são referenciados fracamente pelo cache de imagens, para que
+    # suas surfaces sejam convertidas para o formato da tela quando ela é
+    # criada. Cada sprite também guarda, fracamente, os grupos que o contêm,
+    # para avisá-los quando se move.
+    __slots__ = ('__weakref__', '_groups')
+
+
+
+    def _mark(self):
+
+        # O atributo só existe depois que o sprite entra num grupo.
+        groups = getattr(self, '_groups', None)
+        if not groups: return
+
+        for group in groups:
+            group._moved.add(self)
 
 
 
@@ -90,6 +105,7 @@ class Sprite(object):
             raise TypeError('o atributo "top" precisa ser inteiro')
 
         self._rect.top = value
+        self._mark()
 
 
 
@@ -112,6 +128,7 @@ class Sprite(object):
             raise TypeError('o atributo "left" precisa ser inteiro')
 
         self._rect.left = value
+        self._mark()
 
 
 
@@ -134,6 +151,7 @@ class Sprite(object):
             raise TypeError('o atributo "bottom" precisa ser inteiro')
 
         self._rect.bottom = value
+        self._mark()
 
 
 
@@ -156,6 +174,7 @@ class Sprite(object):
             raise TypeError('o atributo "right" precisa ser inteiro')
 
         self._rect.right = value
+        self._mark()
 
 
 
@@ -178,6 +197,7 @@ class Sprite(object):
             raise TypeError('o atributo "centerx" precisa ser inteiro')
 
         self._rect.centerx = value
+        self._mark()
 
 
 
@@ -200,6 +220,7 @@ class Sprite(object):
             raise TypeError('o atributo "centery" precisa ser inteiro')
 
         self._rect.centery = value
+        self._mark()
 
 
 
@@ -234,6 +255,7 @@ class Sprite(object):
             raise TypeError('o segundo item do atributo "topleft" precisa ser inteiro')
 
         self._rect.topleft = value
+        self._mark()
 
 
 
@@ -268,6 +290,7 @@ class Sprite(object):
             raise TypeError('o segundo item do atributo "bottomleft" precisa ser inteiro')
 
         self._rect.bottomleft  = value
+        self._mark()
 
 
 
@@ -302,6 +325,7 @@ class Sprite(object):
             raise TypeError('o segundo item do atributo "topright" precisa ser inteiro')
 
         self._rect.topright  = value
+        self._mark()
 
 
 
@@ -336,6 +360,7 @@ class Sprite(object):
             raise TypeError('o segundo item do atributo "bottomright" precisa ser inteiro')
 
         self._rect.bottomright = value
+        self._mark()
 
 
 
@@ -370,6 +395,7 @@ class Sprite(object):
             raise TypeError('o segundo item do atributo "midtop" precisa ser inteiro')
 
         self._rect.midtop = value
+        self._mark()
 
 
 
@@ -404,6 +430,7 @@ class Sprite(object):
             raise TypeError('o segundo item do atributo "midleft" precisa ser inteiro')
 
         self._rect.midleft = value
+        self._mark()
 
 
 
@@ -438,6 +465,7 @@ class Sprite(object):
             raise TypeError('o segundo item do atributo "midbottom" precisa ser inteiro')
 
         self._rect.midbottom = value
+        self._mark()
 
 
 
@@ -472,6 +500,7 @@ class Sprite(object):
             raise TypeError('o segundo item do atributo "midright" precisa ser inteiro')
 
         self._rect.midright = value
+        self._mark()
 
 
 
@@ -506,6 +535,7 @@ class Sprite(object):
             raise TypeError('o segundo item do atributo "center" precisa ser inteiro')
 
         self._rect.center = value
+        self._mark()
 
 
 
@@ -532,6 +562,7 @@ class Sprite(object):
                   rect.centery - sprite._rect.centery)
 
         sprite._rect = rect
+        sprite._mark()
 
         return offset
 
@@ -569,6 +600,36 @@ class Sprite(object):
 
 
 
+    def collide_mask(self, sprite):
+        """
+        collide_mask(sprite) -> bool
+
+        Verifica se algum pixel visível do sprite dado se sobrepõe a algum pixel
+        visível deste sprite. É mais preciso, porém mais lento, que o método
+        collide(), que considera os sprites como retângulos.
+
+        São considerados visíveis os pixels com alpha maior que 127, ou, em
+        sprites sem canal alpha, os pixels diferentes da cor-chave.
+
+        São considerados sprites os objetos Image, Label e Animation.
+        """
+
+        if not isinstance(sprite, Sprite):
+            raise TypeError('collide_mask(): o argumento "sprite" precisa ser um objeto Image, Label ou Animation')
+
+        rect = self._rect
+        other = sprite._rect
+
+        # As máscaras só são comparadas se os retângulos se sobrepõem.
+        if not rect.colliderect(other): return False
+
+        mask = mindu.assets._mask(self._surf)
+        offset = (other.x - rect.x, other.y - rect.y)
+
+        return mask.overlap(mindu.assets._mask(sprite._surf), offset) is not None
+
+
+
     def collide_point(self, point):
         """
         collide_point(point) -> bool
@@ -616,7 +677,8 @@ class Sprite(object):
         if not isinstance(y, int):
             raise TypeError('move(): o argumento "y" precisa ser inteiro')
 
-        return self._rect.move_ip(x, y)
+        self._rect.move_ip(x, y)
+        self._mark()
 
 
 
@@ -668,11 +730,20 @@ class Sprite(object):
         if not mindu.loop._running:
             raise mindu.Error('draw(): método chamado com o loop interno do Mindu parado')
 
+        screen = mindu.screen
+
         if self._osd:
-            mindu.screen._osd.append((self._surf, self._rect))
+            screen._osd.append((self._surf, self._rect))
+            return
 
-        else:
-            mindu.screen._surf.blit(self._surf, self._rect)
+        if screen._culling and (not screen._view().colliderect(self._rect)):
+            screen._culled += 1
+            return
 
+        screen._drawn += 1
 
+        if screen._deferred():
+            screen._world.append((self._surf, self._rect.copy()))
 
+        else:
+            screen._surf.blit(self._surf, self._rect)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017 José Falero.
+#
+# ﻿This file is part of Mindu.
+#
+# Mindu is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mindu is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mindu.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Author: José Falero <jzfalero.@gmail.com>.
+"""
+A classe Task está definida aqui.
+"""
+
+
+
+class Task(object):
+    """
+    Objeto representando uma tarefa agendada no loop interno do Mindu.
+
+    Objetos Task são obtidos com os métodos schedule() e delay() do objeto
+    mindu.loop, e servem para cancelar a tarefa.
+    """
+
+    __slots__ = ('_callable', '_pargs', '_kwargs', '_priority', '_rate',
+                 '_alive')
+
+
+
+    def __init__(self, callable, pargs, kwargs, priority, rate):
+        self._callable = callable
+        self._pargs = pargs
+        self._kwargs = kwargs
+        self._priority = priority
+        self._rate = rate
+        self._alive = True
+
+
+
+    def cancel(self):
+        """
+        cancel() -> None
+
+        Cancela a tarefa, para que não seja mais chamada.
+        """
+
+        self._alive = False
+
+
+
+    def alive(self):
+        """
+        alive() -> bool
+
+        Verifica se a tarefa ainda será chamada, isto é, se não foi cancelada e,
+        no caso de tarefas adiadas, se ainda não foi chamada.
+        """
+
+        return self._alive
+
+
+
+    def get_priority(self):
+        """
+        get_priority() -> int
+
+        Obtém a prioridade da tarefa.
+        """
+
+        return self._priority
+
+
+
+    def get_rate(self):
+        """
+        get_rate() -> int ou None
+
+        Obtém a cada quantas iterações a tarefa é chamada. Retorna None se a
+        tarefa é adiada, isto é, chamada uma única vez.
+        """
+
+        return self._rate
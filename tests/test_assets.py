@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da conversão de surfaces para o formato da tela.
+"""
+
+import os
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+import mindu
+
+
+
+class ConvertTest(unittest.TestCase):
+
+
+
+    def tearDown(self):
+        mindu.screen._destroy()
+
+
+
+    def test_copies_sharing_frames_get_converted_surface(self):
+        animation = object.__new__(mindu.Animation)
+
+        animation._surfs = [pygame.Surface((8, 8), 0, 24) for index in range(3)]
+        animation._rects = [surf.get_rect() for surf in animation._surfs]
+        animation._redraw = 1
+        animation._anchor = 'midbottom'
+        animation._repeat = True
+        animation._running = False
+        animation._osd = False
+        animation._redraw_count = 0
+        animation._index = 1
+        animation._limit = len(animation._surfs)
+        animation._surf = animation._surfs[animation._index]
+        animation._rect = animation._rects[animation._index]
+
+        mindu.assets._track(animation)
+        copies = [animation.copy() for index in range(3)]
+
+        mindu.screen._create()
+
+        for sprite in [animation] + copies:
+            self.assertIs(sprite._surfs, animation._surfs)
+            self.assertIs(sprite._surf, sprite._surfs[sprite._index])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da indexação dos sprites nos grupos.
+"""
+
+import os
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import mindu
+
+
+
+class GroupTest(unittest.TestCase):
+
+
+
+    def setUp(self):
+        self.a = mindu.logo.copy()
+        self.b = mindu.logo.copy()
+
+        self.a.topleft = (0, 0)
+        self.b.topleft = (1000, 1000)
+
+        self.group = mindu.Group((self.a, self.b), cell = 32)
+
+
+
+    def tearDown(self):
+        mindu.loop.on_iterate(None)
+
+
+
+    def test_move_after_query_in_same_iteration(self):
+        found = []
+
+        def iterate():
+
+            # A primeira consulta indexa os sprites; o sprite movido depois
+            # dela precisa ser encontrado já na consulta seguinte.
+            self.group.collide_point((1, 1))
+            self.b.topleft = self.a.topleft
+            found.extend(self.group.collide(self.a))
+
+            mindu.loop.stop()
+
+        mindu.loop.on_iterate(iterate)
+        mindu.loop.start()
+
+        self.assertEqual(found, [self.b])
+
+
+
+    def test_moves_of_every_kind_are_seen(self):
+        self.group.collide_point((1, 1))
+
+        self.b.move(-1000, -1000)
+        self.assertEqual(self.group.collide(self.a), [self.b])
+
+        self.a.grab(self.b)
+        self.b.center = (2000, 2000)
+        self.assertEqual(self.group.collide(self.a), [])
+
+
+
+    def test_removed_sprite_stops_marking(self):
+        self.group.remove(self.b)
+        self.b.move(1, 1)
+
+        self.assertNotIn(self.b, self.group._moved)
+        self.assertNotIn(self.group, self.b._groups)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
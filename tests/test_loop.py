@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do agendamento de tarefas do loop.
+"""
+
+import os
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import mindu
+
+
+
+class TaskTest(unittest.TestCase):
+
+
+
+    def test_delayed_stop_keeps_periodic_task(self):
+        calls = []
+
+        # As duas tarefas vencem na mesma iteração, e a que para o loop tem
+        # prioridade maior, então é chamada primeiro.
+        task = mindu.loop.schedule(1, 0, calls.append, 'tick')
+        mindu.loop.delay(1, 1, mindu.loop.stop)
+        mindu.loop.start()
+
+        self.assertEqual(calls, [])
+        self.assertTrue(task.alive())
+        self.assertIn(task, [entry[3] for entry in mindu.loop._tasks])
+
+        mindu.loop.delay(3, 1, mindu.loop.stop)
+        mindu.loop.start()
+        task.cancel()
+
+        self.assertEqual(calls, ['tick', 'tick'])
+
+
+
+    def test_delayed_stop_keeps_pending_delay(self):
+        calls = []
+
+        mindu.loop.delay(1, 1, mindu.loop.stop)
+        task = mindu.loop.delay(1, 0, calls.append, 'once')
+        mindu.loop.start()
+
+        self.assertEqual(calls, [])
+        self.assertTrue(task.alive())
+
+        mindu.loop.delay(2, 1, mindu.loop.stop)
+        mindu.loop.start()
+
+        self.assertEqual(calls, ['once'])
+        self.assertFalse(task.alive())
+
+
+
+if __name__ == '__main__':
+    unittest.main()